@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Benchmark: --extract-mode fast vs layout
+Times both PDF readers over examples/inputs/*.pdf plus synthetic multi-page
+PDFs, and checks how closely the fast text matches the layout text.
+"""
+
+import sys
+import time
+import argparse
+import tempfile
+import difflib
+from collections import Counter
+from pathlib import Path
+
+from braille_cli import PDF_READERS
+
+ROOT = Path(__file__).resolve().parent
+
+LOREM = (
+    "Louis Braille was born on January 4, 1809, in Coupvray, France. "
+    "At the age of three he accidentally blinded himself in his father's workshop. "
+    "By fifteen he had developed a tactile code of raised dots for reading and writing."
+)
+
+
+def write_synthetic_pdf(path, pages, lines_per_page=45):
+    """Minimal single-column PDF (Helvetica, WinAnsi) with no third-party writer."""
+    words = LOREM.split()
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # pages tree, filled in once the kids are known
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    kids = []
+    for p in range(pages):
+        ops = [b"BT /F1 10 Tf 12 TL 56 800 Td"]
+        for ln in range(lines_per_page):
+            start = (p * lines_per_page + ln) % len(words)
+            line = ' '.join((words * 2)[start:start + 14])
+            line = line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+            ops.append(f"({line}) Tj T*".encode('latin-1'))
+        ops.append(b"ET")
+        stream = b"\n".join(ops)
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        content_id = len(objects)
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+                       b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id)
+        kids.append(len(objects))
+    objects[1] = (b"<< /Type /Pages /Count %d /Kids [" % pages
+                  + b" ".join(b"%d 0 R" % k for k in kids) + b"] >>")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for num, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % num + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % off for off in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    Path(path).write_bytes(bytes(out))
+    return path
+
+
+def extract(path, mode):
+    reader = PDF_READERS[mode](path)
+    try:
+        return [reader.page_text(i) or '' for i in range(len(reader))]
+    finally:
+        reader.close()
+
+
+def time_mode(path, mode, repeat):
+    best = float('inf')
+    pages = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        pages = extract(path, mode)
+        best = min(best, time.perf_counter() - start)
+    return best, pages
+
+
+def sequence_ratio(reference, candidate):
+    ratios = [difflib.SequenceMatcher(None, a, b, autojunk=False).ratio()
+              for a, b in zip(reference, candidate)]
+    return sum(ratios) / len(ratios) if ratios else 1.0
+
+
+def token_f1(reference, candidate):
+    # Letters within a token are compared as a multiset, so Arabic words the
+    # layout extractor emits in visual (reversed) order still count as matches
+    def bag(pages):
+        return Counter(''.join(sorted(tok)) for page in pages for tok in page.split())
+    ref, cand = bag(reference), bag(candidate)
+    common = sum((ref & cand).values())
+    if not ref and not cand:
+        return 1.0
+    if not common:
+        return 0.0
+    precision = common / sum(cand.values())
+    recall = common / sum(ref.values())
+    return 2 * precision * recall / (precision + recall)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark fast vs layout PDF extraction')
+    parser.add_argument('pdfs', nargs='*', help='Extra PDF files to include')
+    parser.add_argument('--synthetic', type=int, nargs='*', default=[20, 100], metavar='PAGES',
+                        help='Page counts of synthetic PDFs to generate (default: 20 100)')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per mode, best is kept')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        inputs = sorted((ROOT / 'examples' / 'inputs').glob('*.pdf'))
+        inputs += [Path(p) for p in args.pdfs]
+        inputs += [write_synthetic_pdf(Path(tmp) / f"synthetic_{n}p.pdf", n) for n in args.synthetic]
+
+        print(f"{'file':<24}{'pages':>6}{'layout s':>10}{'fast s':>9}{'speedup':>9}"
+              f"{'seq':>7}{'tok F1':>8}")
+        for path in inputs:
+            layout_s, layout_pages = time_mode(path, 'layout', args.repeat)
+            fast_s, fast_pages = time_mode(path, 'fast', args.repeat)
+            print(f"{path.name:<24}{len(layout_pages):>6}{layout_s:>10.3f}{fast_s:>9.3f}"
+                  f"{layout_s / fast_s:>8.1f}x"
+                  f"{sequence_ratio(layout_pages, fast_pages):>7.2f}"
+                  f"{token_f1(layout_pages, fast_pages):>8.2f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
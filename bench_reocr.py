@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark: --ocr-mode two-pass vs single pass and full-image upscaling
+Runs over a labelled sample set: every image in the directory needs a
+ground-truth file next to it named <stem>.gt.txt.
+"""
+
+import io
+import sys
+import time
+import argparse
+import difflib
+from pathlib import Path
+
+from braille_cli import FileProcessor
+
+IMAGE_TYPES = ('.png', '.jpg', '.jpeg', '.tif', '.tiff')
+
+
+def accuracy(truth, text):
+    # Character-level similarity, ignoring line wrapping and spacing differences
+    a, b = ' '.join(truth.split()), ' '.join(text.split())
+    return difflib.SequenceMatcher(None, a, b, autojunk=False).ratio()
+
+
+def upscaled(path, scale):
+    from PIL import Image
+    image = Image.open(path)
+    image = image.resize((round(image.width * scale), round(image.height * scale)), Image.LANCZOS)
+    buffer = io.BytesIO()
+    image.save(buffer, format='PNG')
+    buffer.seek(0)
+    return buffer
+
+
+def run(processor, source, lang):
+    start = time.perf_counter()
+    try:
+        text = processor.extract_image(source, languages=lang)
+    except ValueError:
+        text = ''
+    return time.perf_counter() - start, text
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark confidence-driven re-OCR')
+    parser.add_argument('samples', help='Directory of images with <stem>.gt.txt labels')
+    parser.add_argument('--lang', default='eng+ara', help='Tesseract languages (default: eng+ara)')
+    parser.add_argument('--scale', type=float, default=2.0, help='Upscale factor (default: 2)')
+    parser.add_argument('--threshold', type=float, default=60, help='Re-OCR confidence threshold')
+    args = parser.parse_args()
+
+    quiet = lambda *a, **k: None
+    single = FileProcessor(log_callback=quiet)
+    two_pass = FileProcessor(log_callback=quiet, ocr_mode='two-pass',
+                             reocr_threshold=args.threshold, reocr_scale=args.scale)
+
+    samples = [p for p in sorted(Path(args.samples).iterdir())
+               if p.suffix.lower() in IMAGE_TYPES and p.with_suffix('.gt.txt').exists()]
+    if not samples:
+        print(f"No labelled images in {args.samples} (expected <stem>.gt.txt files)")
+        return 1
+
+    totals = {'single': [0.0, 0.0], 'upscale': [0.0, 0.0], 'two-pass': [0.0, 0.0]}
+    print(f"{'file':<28}{'single':>16}{f'{args.scale:g}x upscale':>16}{'two-pass':>16}")
+    for path in samples:
+        truth = path.with_suffix('.gt.txt').read_text(encoding='utf-8')
+        row = {
+            'single': run(single, path, args.lang),
+            'upscale': run(single, upscaled(path, args.scale), args.lang),
+            'two-pass': run(two_pass, path, args.lang),
+        }
+        cells = ''
+        for mode, (seconds, text) in row.items():
+            acc = accuracy(truth, text)
+            totals[mode][0] += seconds
+            totals[mode][1] += acc
+            cells += f"{seconds:>7.2f}s {acc:>6.1%}"
+        print(f"{path.name:<28}{cells}")
+
+    n = len(samples)
+    print()
+    for mode, (seconds, acc) in totals.items():
+        print(f"{mode:<10} {seconds:>8.2f}s total   {acc / n:>6.1%} mean accuracy")
+    saved = totals['upscale'][0] - totals['two-pass'][0]
+    delta = (totals['two-pass'][1] - totals['upscale'][1]) / n
+    print(f"\ntwo-pass vs {args.scale:g}x upscale: {saved:+.2f}s saved, {delta:+.1%} accuracy")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,17 +1,90 @@
 #!/usr/bin/env python3
 """
 Braille Converter - PDF/Image to Braille (English & Arabic) with Word export
-Supports: PDF, PNG, JPG/JPEG → TXT, DOCX (normal), DOCX (braille)
+Supports: PDF, PNG, JPG/JPEG, TIFF, TXT, DOCX, EPUB, HTML → TXT, DOCX (normal), DOCX (braille)
 """
 
+import io
 import os
+import json
+import shutil
+import hashlib
+import math
+import asyncio
 import sys
 import re
+import mmap
+import codecs
+import struct
+import zipfile
+import collections
 import argparse
+import posixpath
+from urllib.parse import unquote
+from html.parser import HTMLParser
+from xml.etree import ElementTree
+import queue
+import signal
+import pickle
+import threading
+import time
+import multiprocessing
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
 from pathlib import Path
+from dataclasses import dataclass, field
 from typing import Optional
 
 
+class ConversionCancelled(Exception):
+    pass
+
+
+class ExtractionTimeout(Exception):
+    pass
+
+
+class WorkerCrashed(Exception):
+    pass
+
+
+class CancellationToken:
+    """Shared flag checked between pages/images; set it from any thread."""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def raise_if_cancelled(self):
+        if self._event.is_set():
+            raise ConversionCancelled("Conversion cancelled")
+
+
+class BrailleTable(dict):
+    """str.translate() table; characters not listed are resolved once, then cached."""
+
+    def __init__(self, mapping, capital=None):
+        super().__init__((ord(k), v) for k, v in mapping.items())
+        self.mapping = mapping
+        self.capital = capital
+    
+    def __missing__(self, code):
+        char = chr(code)
+        if self.capital and char.isupper():
+            lower = char.lower()
+            value = self.capital + self.mapping.get(lower, lower)
+        else:
+            value = char
+        self[code] = value
+        return value
+
+
 class BrailleConverter:
     ENGLISH_BRAILLE = {
         'a': '⠁', 'b': '⠃', 'c': '⠉', 'd': '⠙', 'e': '⠑', 'f': '⠋', 'g': '⠛', 'h': '⠓',
@@ -41,9 +114,27 @@ class BrailleConverter:
     
     CAPITAL_INDICATOR = '⠠'
     
+    ARABIC_RANGE = '\u0600-\u06FF\u0750-\u077F'
+    
     def __init__(self):
         self.arabic_pattern = re.compile(r'[\u0600-\u06FF\u0750-\u077F]+')
         self.english_pattern = re.compile(r'[a-zA-Z]+')
+        # Neutrals (spaces, punctuation) between two runs of the same script are
+        # absorbed into that run, so runs change only where direction can
+        a, letter = self.ARABIC_RANGE, rf'[^\W_{self.ARABIC_RANGE}0-9]'
+        self.script_pattern = re.compile(
+            rf'(?P<arabic>[{a}](?:[\W{a}_]*[{a}])?)'
+            rf'|(?P<latin>{letter}(?:[^{a}0-9]*{letter})?)'
+            rf'|(?P<digit>[0-9]+)'
+            rf'|(?P<neutral>(?:[^\w{a}]|_)+)'
+        )
+        # Translation is per character (Arabic letters by the Arabic table,
+        # everything else by the English one), so one merged table needs no
+        # script segmentation
+        self.braille_table = BrailleTable(
+            {**self.ENGLISH_BRAILLE,
+             **{k: v for k, v in self.ARABIC_BRAILLE.items() if self.is_arabic(k)}},
+            capital=self.CAPITAL_INDICATOR)
     
     def is_arabic(self, char):
         return '\u0600' <= char <= '\u06FF' or '\u0750' <= char <= '\u077F'
@@ -55,19 +146,15 @@ class BrailleConverter:
             return 'mixed'
         return 'arabic' if arabic_count > 0 else 'english'
     
+    def script_runs(self, text):
+        """Yield (script, start, end) in one pass; script is arabic, latin, digit or neutral."""
+        for m in self.script_pattern.finditer(text):
+            yield m.lastgroup, m.start(), m.end()
+    
     def text_to_braille(self, text):
         if not text:
             return ""
-        result = []
-        for char in text:
-            if self.is_arabic(char):
-                result.append(self.ARABIC_BRAILLE.get(char, char))
-            else:
-                if char.isupper():
-                    result.append(self.CAPITAL_INDICATOR)
-                    char = char.lower()
-                result.append(self.ENGLISH_BRAILLE.get(char, char))
-        return ''.join(result)
+        return text.translate(self.braille_table)
     
     def get_language_stats(self, text):
         arabic_count = sum(1 for c in text if self.is_arabic(c))
@@ -80,78 +167,924 @@ class BrailleConverter:
         }
 
 
-class FileProcessor:
-    def __init__(self):
-        self.converter = BrailleConverter()
-    
-    def extract_pdf(self, path):
+class LayoutPdfReader:
+    """Full pdfplumber layout reconstruction (Arabic comes out in visual order)."""
+
+    def __init__(self, path):
         try:
             import pdfplumber
+            from pdfminer.pdfpage import PDFPage
         except ImportError:
             raise ImportError("Install pdfplumber: pip install pdfplumber")
+        self._pdf = pdfplumber.open(path)
+        # pdf.pages builds every page up front; walk the page tree lazily
+        # instead, only as far as the highest page asked for
+        self._tree = PDFPage.create_pages(self._pdf.doc)
+        self._pages = []
+    
+    def _page(self, index):
+        while len(self._pages) <= index:
+            page = next(self._tree, None)
+            if page is None:
+                raise IndexError(f"Page {index + 1} out of range")
+            self._pages.append(page)
+        return self._pages[index]
+    
+    def __len__(self):
+        self._pages.extend(self._tree)
+        return len(self._pages)
+    
+    def page_text(self, index):
+        from pdfplumber.page import Page
+        page = Page(self._pdf, self._page(index), page_number=index + 1, initial_doctop=0)
+        try:
+            return page.extract_text()
+        finally:
+            page.close()
+    
+    def close(self):
+        self._pdf.close()
+
+
+class FastPdfReader:
+    """Reads the text layer in stream order via pdfium, without layout analysis.
+
+    pdfium emits Arabic runs in logical order, so no bidi reordering is needed.
+    """
+
+    def __init__(self, path):
+        try:
+            import pypdfium2
+        except ImportError:
+            raise ImportError("Install pypdfium2: pip install pypdfium2")
+        self._pdf = pypdfium2.PdfDocument(path)
+    
+    def __len__(self):
+        return len(self._pdf)
+    
+    def page_text(self, index):
+        if not 0 <= index < len(self._pdf):
+            raise IndexError(f"Page {index + 1} out of range")
+        page = self._pdf[index]
+        textpage = page.get_textpage()
+        try:
+            text = textpage.get_text_range()
+        finally:
+            textpage.close()
+            page.close()
+        lines = text.replace('\r\n', '\n').replace('\r', '\n').split('\n')
+        return '\n'.join(line.rstrip() for line in lines).strip('\n')
+    
+    def close(self):
+        self._pdf.close()
+
+
+PDF_READERS = {
+    'layout': LayoutPdfReader,
+    'fast': FastPdfReader,
+}
+
+
+def _pdf_page_worker(conn, source, mode):
+    # Serves len / page_text requests for PdfPageProcess until told to stop
+    parent = os.getppid()
+    
+    def orphaned():
+        # A killed parent can't kill us: don't keep extracting for nobody
+        while os.getppid() == parent:
+            time.sleep(1)
+        os._exit(1)
+    
+    threading.Thread(target=orphaned, daemon=True).start()
+    try:
+        reader = PDF_READERS[mode](source if isinstance(source, str) else io.BytesIO(source))
+    except Exception as e:
+        reader, failure = None, e
+    conn.send(('ready', None))
+    while True:
+        try:
+            request = conn.recv()
+        except EOFError:
+            return
+        if request is None:
+            break
+        try:
+            if reader is None:
+                raise failure
+            conn.send(('done', len(reader) if request == 'len' else reader.page_text(request)))
+        except Exception as e:
+            try:
+                pickle.dumps(e)
+            except Exception:
+                e = ValueError(str(e))
+            conn.send(('error', e))
+    if reader is not None:
+        reader.close()
+
+
+class PdfPageProcess:
+    """PDF reader that extracts in a child process, so a page over its time
+    budget is killed rather than left running.
+
+    The child is started on first use and again after each kill, reopening
+    the PDF; page_text() and len() otherwise behave as the in-process
+    readers in PDF_READERS.
+    """
+
+    def __init__(self, source, mode='layout'):
+        if isinstance(source, io.BytesIO):
+            source = source.getvalue()
+        elif isinstance(source, os.PathLike):
+            source = os.fspath(source)
+        self.source = source
+        self.mode = mode
+        methods = multiprocessing.get_all_start_methods()
+        # forkserver starts each child from a warm, single-threaded parent;
+        # spawn (Windows, macOS without it) pays a fresh interpreter per child
+        self._context = multiprocessing.get_context(
+            'forkserver' if 'forkserver' in methods else 'spawn')
+        if 'forkserver' in methods:
+            # Import the PDF libraries once in the server rather than per child
+            # (only takes effect before the server first starts)
+            self._context.set_forkserver_preload(['__main__', __name__, 'pdfplumber',
+                                                  'pypdfium2'])
+        self._process = None
+        self._conn = None
+    
+    def _start(self):
+        if multiprocessing.current_process().daemon:
+            # Inside an IsolatedProcessor worker: its children die with it
+            # (they watch their parent), so they may be started
+            multiprocessing.current_process().daemon = False
+        self._conn, child = self._context.Pipe()
+        self._process = self._context.Process(target=_pdf_page_worker, daemon=True,
+                                              args=(child, self.source, self.mode))
+        self._process.start()
+        child.close()
+    
+    def _kill(self):
+        self._process.kill()
+        self._process.join()
+        self._conn.close()
+        self._process = self._conn = None
+    
+    def _receive(self, timeout=None, cancel=None):
+        deadline = time.monotonic() + timeout if timeout else None
+        while True:
+            wait_for = FileProcessor.POLL_INTERVAL
+            if deadline is not None:
+                wait_for = max(0, min(wait_for, deadline - time.monotonic()))
+            try:
+                if self._conn.poll(wait_for):
+                    return self._conn.recv()
+            except (EOFError, OSError):
+                exitcode = self._process.exitcode
+                self._kill()
+                raise WorkerCrashed(f"PDF page extraction died (exit code {exitcode})")
+            if cancel is not None and cancel.cancelled:
+                self._kill()
+                cancel.raise_if_cancelled()
+            if deadline is not None and time.monotonic() >= deadline:
+                self._kill()
+                raise ExtractionTimeout(f"Timed out after {timeout:g}s")
+    
+    def _request(self, request, timeout=None, cancel=None):
+        if self._process is None:
+            self._start()
+            # Opening the PDF doesn't count against the page's budget
+            self._receive(cancel=cancel)
+        self._conn.send(request)
+        status, value = self._receive(timeout, cancel)
+        if status == 'error':
+            raise value
+        return value
+    
+    def __len__(self):
+        return self._request('len')
+    
+    def page_text(self, index, timeout=None, cancel=None):
+        return self._request(index, timeout, cancel)
+    
+    def close(self):
+        if self._process is None:
+            return
+        try:
+            self._conn.send(None)
+        except OSError:
+            pass
+        self._process.join(5)
+        if self._process.is_alive():
+            self._process.kill()
+            self._process.join()
+        self._conn.close()
+        self._process = self._conn = None
+
+
+INPUT_SIGNATURES = [
+    (b'%PDF-', '.pdf'),
+    (b'\x89PNG\r\n\x1a\n', '.png'),
+    (b'\xff\xd8\xff', '.jpg'),
+    (b'II*\x00', '.tiff'),
+    (b'MM\x00*', '.tiff'),
+]
+
+STREAM_CHUNK = 64 * 1024
+
+STREAMED_TYPES = ('.txt', '.html', '.htm', '.xhtml')
+
+# <meta charset=...>, <meta http-equiv content="...; charset=..."> or <?xml encoding=...?>
+HTML_CHARSET = re.compile(rb'<meta[^>]*?charset\s*=\s*["\']?\s*([\w.:-]+)'
+                          rb'|<\?xml[^>]*?encoding\s*=\s*["\']([\w.:-]+)', re.IGNORECASE)
+# As browsers do: a byte-oriented page can't really be UTF-16, and latin-1 means cp1252
+HTML_CHARSET_ALIASES = {'utf-16': 'utf-8', 'utf-16-le': 'utf-8', 'utf-16-be': 'utf-8',
+                        'iso8859-1': 'cp1252', 'ascii': 'cp1252'}
+
+OCR_MODES = ('single', 'two-pass')
+
+PAGED_TYPES = ('.pdf', '.png', '.jpg', '.jpeg', '.tif', '.tiff')
+
+SUPPORTED_TYPES = PAGED_TYPES + STREAMED_TYPES + ('.docx', '.epub')
+
+
+def parse_page_ranges(spec):
+    """'120-135,400' -> ((120, 135), (400, 400)); an open end ('400-') runs to the last page."""
+    ranges = []
+    for part in spec.replace(' ', '').split(','):
+        match = re.fullmatch(r'(\d+)(-(\d*))?', part)
+        if not match or int(match[1]) < 1:
+            raise ValueError(f"Invalid page range: {part!r} (expected e.g. 120-135,400)")
+        start = int(match[1])
+        end = start if not match[2] else int(match[3]) if match[3] else None
+        if end is not None and end < start:
+            raise ValueError(f"Invalid page range: {part!r} (end before start)")
+        ranges.append((start, end))
+    return tuple(ranges)
+
+
+def format_page_ranges(ranges):
+    return ','.join(str(start) if start == end else f"{start}-{end or ''}"
+                    for start, end in ranges)
+
+
+def page_numbers(ranges, total=None):
+    """Sorted page numbers in ranges; total is required to close open-ended ones."""
+    numbers = set()
+    for start, end in ranges:
+        numbers.update(range(start, (total if end is None else end) + 1))
+    return sorted(numbers)
+
+
+def sniff_type(head):
+    for magic, ext in INPUT_SIGNATURES:
+        if head.startswith(magic):
+            return ext
+    if head.startswith(b'PK\x03\x04'):
+        # EPUB requires an uncompressed 'mimetype' entry first in the archive
+        return '.epub' if b'mimetypeapplication/epub+zip' in head[:100] else '.docx'
+    start = head[:512].lstrip(b'\xef\xbb\xbf \t\r\n').lower()
+    if start.startswith((b'<!doctype html', b'<html')):
+        return '.html'
+    return '.txt'
+
+
+def source_label(source):
+    return str(source) if isinstance(source, (str, os.PathLike)) else '<stdin>'
+
+
+class HtmlParagraphParser(HTMLParser):
+    """Push parser that collects block-level text; drain .paragraphs after each feed()."""
+
+    BLOCK_TAGS = {
+        'p', 'div', 'br', 'li', 'tr', 'dt', 'dd', 'pre', 'blockquote', 'section',
+        'article', 'aside', 'header', 'footer', 'figcaption', 'caption', 'hr',
+        'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
+    }
+    SKIP_TAGS = {'head', 'script', 'style', 'template', 'noscript'}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.paragraphs = []
+        self._buffer = []
+        self._skip = 0
+    
+    def _flush(self):
+        text = ' '.join(''.join(self._buffer).split())
+        self._buffer = []
+        if text:
+            self.paragraphs.append(text)
+    
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIP_TAGS:
+            self._skip += 1
+        elif tag in self.BLOCK_TAGS:
+            self._flush()
+    
+    def handle_endtag(self, tag):
+        if tag in self.SKIP_TAGS:
+            self._skip = max(0, self._skip - 1)
+        elif tag in self.BLOCK_TAGS:
+            self._flush()
+    
+    def handle_data(self, data):
+        if not self._skip:
+            self._buffer.append(data)
+    
+    def close(self):
+        super().close()
+        self._flush()
+
+
+class FileProcessor:
+    POLL_INTERVAL = 0.1
+    # A document with this many timed-out pages fails instead of going on
+    MAX_PAGE_TIMEOUTS = 10
+
+    def __init__(self, page_timeout=None, image_timeout=None, extract_mode='layout',
+                 log_callback=None, ocr_workers=None, progress_callback=None,
+                 ocr_mode='single', reocr_threshold=60, reocr_scale=2.0, pages=None):
+        if extract_mode not in PDF_READERS:
+            raise ValueError(f"Unknown extract mode: {extract_mode}. Use {', '.join(PDF_READERS)}")
+        if ocr_mode not in OCR_MODES:
+            raise ValueError(f"Unknown OCR mode: {ocr_mode}. Use {', '.join(OCR_MODES)}")
+        self.converter = BrailleConverter()
+        self.extract_mode = extract_mode
+        self.page_timeout = page_timeout
+        self.image_timeout = image_timeout
+        self.ocr_workers = ocr_workers
+        self.ocr_mode = ocr_mode
+        self.reocr_threshold = reocr_threshold
+        self.reocr_scale = reocr_scale
+        # Page/frame selection, e.g. '120-135,400'; None converts everything
+        self.pages = parse_page_ranges(pages) if isinstance(pages, str) else pages
+        self.events = []
+        self._log = log_callback or print
+        self._progress = progress_callback or (lambda stage, current, total: None)
+    
+    def _record(self, kind, **details):
+        self.events.append(dict(kind=kind, **details))
+    
+    def _selected(self, total, unit='page'):
+        # total may be None when every range is closed: the caller then
+        # finds the end of the document by running into it
+        if self.pages is None:
+            return list(range(1, total + 1))
+        numbers = page_numbers(self.pages, total)
+        if total is not None and numbers and numbers[-1] > total:
+            self._log(f"  Warning: requested {unit}s past {total} ignored ({total} {unit}(s) in input)")
+            numbers = [n for n in numbers if n <= total]
+        if not numbers:
+            raise ValueError(f"None of the requested {unit}s are in the input")
+        return numbers
+    
+    def _page_label(self, number):
+        # Partial conversions are labelled with the source page numbers
+        return '' if self.pages is None else f"Page {number}\n"
+    
+    def _run_with_timeout(self, func, timeout=None, cancel=None, on_abandon=None):
+        """Run func in a thread and stop waiting for it after timeout seconds.
+
+        Threads can't be killed: a timed-out call only stops being waited
+        for and keeps running (and holding the GIL) until func returns, when
+        on_abandon() is called to release what it was using. PDF page
+        timeouts therefore go through PdfPageProcess, which can kill.
+        """
+        # Nothing to watch: run inline and skip the thread overhead
+        if not timeout and cancel is None:
+            return func()
+        
+        outcome = {}
+        done = threading.Event()
+        lock = threading.Lock()
+        
+        def target():
+            try:
+                outcome['value'] = func()
+            except BaseException as e:
+                outcome['error'] = e
+            finally:
+                with lock:
+                    done.set()
+                    abandoned = outcome.get('abandoned')
+                if abandoned and on_abandon is not None:
+                    on_abandon()
+        
+        def abandon():
+            # False if func finished in the meantime: the caller still owns its result
+            with lock:
+                if not done.is_set():
+                    outcome['abandoned'] = True
+                return outcome.get('abandoned', False)
         
-        extracted = []
-        with pdfplumber.open(path) as pdf:
-            total = len(pdf.pages)
-            print(f"Processing PDF with {total} page(s)...")
-            for i, page in enumerate(pdf.pages, 1):
-                print(f"  Page {i}/{total}...", end='\r')
-                text = page.extract_text()
+        # Daemon thread: an abandoned call must not keep the interpreter alive
+        threading.Thread(target=target, daemon=True).start()
+        deadline = time.monotonic() + timeout if timeout else None
+        while not done.wait(self.POLL_INTERVAL):
+            if cancel is not None and cancel.cancelled and abandon():
+                cancel.raise_if_cancelled()
+            if deadline is not None and time.monotonic() >= deadline and abandon():
+                raise ExtractionTimeout(f"Timed out after {timeout:g}s")
+        
+        if 'error' in outcome:
+            raise outcome['error']
+        return outcome['value']
+    
+    def iter_pdf(self, path, cancel=None):
+        if self.page_timeout:
+            # Each page runs in a child process that is killed at the deadline
+            reader = PdfPageProcess(path, self.extract_mode)
+            read = partial(reader.page_text, timeout=self.page_timeout, cancel=cancel)
+        else:
+            reader = PDF_READERS[self.extract_mode](path)
+            read = reader.page_text
+        extracted = 0
+        timeouts = 0
+        try:
+            # Counting pages means walking the whole page tree, which closed
+            # ranges don't need: only the requested pages are ever opened
+            bounded = self.pages is not None and all(end for _, end in self.pages)
+            total = None if bounded else len(reader)
+            numbers = self._selected(total)
+            count = len(numbers)
+            if self.pages is None:
+                self._log(f"Processing PDF with {total} page(s)...")
+            else:
+                self._log(f"Processing PDF pages {format_page_ranges(self.pages)} "
+                          f"({count} page(s))...")
+            for k, i in enumerate(numbers, 1):
+                if cancel is not None:
+                    cancel.raise_if_cancelled()
+                self._log(f"  Page {i}/{total}..." if self.pages is None
+                          else f"  Page {i} ({k}/{count})...", end='\r')
+                self._progress('page', k, count)
+                try:
+                    if self.page_timeout:
+                        text = read(i - 1)
+                    else:
+                        # Cancelling abandons the call, which closes the reader when it returns
+                        text = self._run_with_timeout(partial(read, i - 1), cancel=cancel,
+                                                      on_abandon=reader.close)
+                except ConversionCancelled:
+                    if not self.page_timeout:
+                        reader = None
+                    raise
+                except ExtractionTimeout as e:
+                    timeouts += 1
+                    self._log(f"\n  Warning: Page {i} skipped ({e})")
+                    self._record('page_timeout', source=source_label(path), page=i,
+                                 seconds=self.page_timeout)
+                    if timeouts >= self.MAX_PAGE_TIMEOUTS:
+                        raise ExtractionTimeout(f"{timeouts} pages timed out after "
+                                                f"{self.page_timeout:g}s each; giving up")
+                    continue
+                except IndexError:
+                    self._log(f"\n  Warning: PDF ends before page {i}; later pages ignored")
+                    break
                 if text:
-                    extracted.append(text)
+                    extracted += 1
+                    yield i, self._page_label(i) + text
                 else:
-                    print(f"\n  Warning: Page {i} empty or image-only")
-            print()
+                    self._log(f"\n  Warning: Page {i} empty or image-only")
+            self._log()
+        finally:
+            if reader is not None:
+                reader.close()
         
         if not extracted:
             raise ValueError("No text extracted from PDF")
-        return '\n\n'.join(extracted)
     
-    def extract_image(self, path, languages=None):
+    def extract_pdf(self, path, cancel=None):
+        return '\n\n'.join(text for _, text in self.iter_pdf(path, cancel=cancel))
+    
+    def _tesseract(self, func, image, lang, timeout=None, cancel=None, **kwargs):
+        timeout = (self.image_timeout if timeout is None else timeout) or 0
+        
+        def run():
+            try:
+                return func(image, lang=lang, timeout=timeout, **kwargs)
+            except RuntimeError as e:
+                # pytesseract kills the tesseract process and raises this
+                if 'timeout' in str(e).lower():
+                    raise ExtractionTimeout(f"Timed out after {timeout:g}s")
+                raise
+        
+        return self._run_with_timeout(run, cancel=cancel)
+    
+    def _ocr(self, image, lang, cancel=None):
+        import pytesseract
+        if self.ocr_mode == 'two-pass':
+            return self._ocr_two_pass(image, lang, cancel)
+        return self._tesseract(pytesseract.image_to_string, image, lang, cancel=cancel)
+    
+    def _ocr_two_pass(self, image, lang, cancel=None):
+        # Pass 1 at source resolution; only lines holding a word below
+        # reocr_threshold are cropped, upscaled and re-read as a single line
+        import pytesseract
+        from PIL import Image
+        
+        start = time.monotonic()
+        data = self._tesseract(pytesseract.image_to_data, image, lang, cancel=cancel,
+                               output_type=pytesseract.Output.DICT)
+        first_pass = time.monotonic() - start
+        
+        lines = {}
+        for i, word in enumerate(data['text']):
+            if not word.strip():
+                continue
+            key = (data['block_num'][i], data['par_num'][i], data['line_num'][i])
+            lines.setdefault(key, []).append(
+                (word, float(data['conf'][i]), data['left'][i], data['top'][i],
+                 data['left'][i] + data['width'][i], data['top'][i] + data['height'][i]))
+        
+        text_by_line = {key: ' '.join(w[0] for w in words) for key, words in lines.items()}
+        scale = self.reocr_scale
+        retried = improved = 0
+        for key, words in lines.items():
+            confs = [w[1] for w in words]
+            if min(confs) >= self.reocr_threshold:
+                continue
+            remaining = None
+            if self.image_timeout:
+                remaining = self.image_timeout - (time.monotonic() - start)
+                if remaining <= 0:
+                    break  # out of budget: keep first-pass text for the rest
+            
+            left, top = min(w[2] for w in words), min(w[3] for w in words)
+            right, bottom = max(w[4] for w in words), max(w[5] for w in words)
+            pad = max(4, (bottom - top) // 4)
+            region = image.crop((max(0, left - pad), max(0, top - pad),
+                                 min(image.width, right + pad), min(image.height, bottom + pad)))
+            region = region.resize((max(1, round(region.width * scale)),
+                                    max(1, round(region.height * scale))), Image.LANCZOS)
+            retried += 1
+            try:
+                redo = self._tesseract(pytesseract.image_to_data, region, lang, remaining, cancel,
+                                       config='--psm 7', output_type=pytesseract.Output.DICT)
+            except ExtractionTimeout:
+                break
+            
+            new = [(w, float(c)) for w, c in zip(redo['text'], redo['conf']) if w.strip()]
+            if new and sum(c for _, c in new) / len(new) > sum(confs) / len(confs):
+                text_by_line[key] = ' '.join(w for w, _ in new)
+                improved += 1
+        
+        # Same layout as image_to_string: lines by newline, paragraphs by a blank line
+        out = []
+        prev = None
+        for key, line in text_by_line.items():
+            if prev is not None:
+                out.append('\n' if key[:2] == prev[:2] else '\n\n')
+            out.append(line)
+            prev = key
+        
+        self._record('reocr', lines=len(lines), retried=retried, improved=improved,
+                     seconds=round(time.monotonic() - start, 3),
+                     upscale_estimate=round(first_pass * scale ** 2, 3))
+        return ''.join(out)
+    
+    def _ocr_image(self, image, languages=None, cancel=None, label='', verbose=True):
+        log = self._log if verbose else (lambda *args, **kwargs: None)
+        try:
+            if languages is None:
+                try:
+                    log("  Trying eng+ara...")
+                    return self._ocr(image, 'eng+ara', cancel)
+                except ConversionCancelled:
+                    raise
+                except ExtractionTimeout:
+                    # eng-only is the cheaper model; retry once with it
+                    log("  eng+ara OCR timed out, retrying with eng only")
+                    self._record('image_timeout', source=label, lang='eng+ara',
+                                 seconds=self.image_timeout)
+                    return self._ocr(image, 'eng', cancel)
+                except:
+                    log("  Arabic not available, using eng only")
+                    return self._ocr(image, 'eng', cancel)
+            return self._ocr(image, languages, cancel)
+        except ExtractionTimeout as e:
+            self._record('image_timeout', source=label, lang=languages or 'eng',
+                         seconds=self.image_timeout)
+            raise ValueError(f"OCR {e}")
+    
+    def _iter_frames(self, image, languages=None, cancel=None, label=''):
+        total = image.n_frames
+        numbers = self._selected(total, 'frame')
+        count = len(numbers)
+        workers = self.ocr_workers or os.cpu_count() or 1
+        self._log(f"Performing OCR on {count} frame(s) with {workers} worker(s)...")
+        
+        def selected_frames():
+            # seek() only walks the frame directory; skipped frames are never decoded
+            for k, i in enumerate(numbers, 1):
+                image.seek(i - 1)
+                yield k, i, image
+        
+        frames = selected_frames()
+        pending = collections.deque()
+        found = False
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            try:
+                while True:
+                    # Decode lazily: only a couple of frames per worker are in flight
+                    while len(pending) < 2 * workers:
+                        if cancel is not None:
+                            cancel.raise_if_cancelled()
+                        k, i, frame = next(frames, (None, None, None))
+                        if frame is None:
+                            break
+                        pending.append((k, i, pool.submit(self._ocr_image, frame.copy(), languages,
+                                                          cancel, f"{label}#{i}", False)))
+                    if not pending:
+                        break
+                    
+                    k, i, future = pending.popleft()
+                    try:
+                        text = future.result()
+                    except ValueError as e:
+                        self._log(f"\n  Warning: Frame {i} skipped ({e})")
+                        continue
+                    self._log(f"  Frame {i}/{total}...", end='\r')
+                    self._progress('frame', k, count)
+                    if not text.strip():
+                        self._log(f"\n  Warning: Frame {i} empty")
+                        continue
+                    yield i, self._page_label(i) + text
+                    found = True
+                self._log()
+            finally:
+                for _, _, future in pending:
+                    future.cancel()
+        
+        if not found:
+            raise ValueError("No text extracted from image")
+    
+    def iter_image(self, path, languages=None, cancel=None):
         try:
             from PIL import Image
             import pytesseract
         except ImportError as e:
             raise ImportError(f"Install pytesseract and Pillow: pip install pytesseract Pillow")
         
-        print("Performing OCR...")
+        if cancel is not None:
+            cancel.raise_if_cancelled()
         image = Image.open(path)
+        if getattr(image, 'n_frames', 1) > 1:
+            yield from self._iter_frames(image, languages, cancel, source_label(path))
+            return
         
-        if languages is None:
-            try:
-                print("  Trying eng+ara...")
-                text = pytesseract.image_to_string(image, lang='eng+ara')
-            except:
-                print("  Arabic not available, using eng only")
-                text = pytesseract.image_to_string(image, lang='eng')
-        else:
-            text = pytesseract.image_to_string(image, lang=languages)
-        
+        self._selected(1)
+        self._log("Performing OCR...")
+        text = self._ocr_image(image, languages, cancel, source_label(path))
         if not text.strip():
             raise ValueError("No text extracted from image")
+        if self.ocr_mode == 'two-pass':
+            reocr = [e for e in self.events if e['kind'] == 'reocr'][-1]
+            # OCR time grows with pixel count, so a full upscale costs ~scale² first passes
+            self._log(f"  Re-OCR: {reocr['retried']}/{reocr['lines']} line(s) retried, "
+                      f"{reocr['improved']} improved, {reocr['seconds']:.1f}s "
+                      f"(~{reocr['upscale_estimate'] - reocr['seconds']:.1f}s saved vs "
+                      f"full {self.reocr_scale:g}x upscale)")
         
         lang = self.converter.detect_language(text)
-        print(f"  Detected: {lang}")
-        return text
+        self._log(f"  Detected: {lang}")
+        yield 1, self._page_label(1) + text
+    
+    def extract_image(self, path, languages=None, cancel=None):
+        return '\n\n'.join(text for _, text in self.iter_image(path, languages, cancel=cancel))
+    
+    def iter_textfile(self, stream, cancel=None, head=b''):
+        decoder = codecs.getincrementaldecoder('utf-8-sig')()
+        chunk = head or stream.read(STREAM_CHUNK)
+        found = False
+        try:
+            while chunk:
+                text = decoder.decode(chunk)
+                found = found or bool(text.strip())
+                yield text
+                if cancel is not None:
+                    cancel.raise_if_cancelled()
+                chunk = stream.read(STREAM_CHUNK)
+            yield decoder.decode(b'', final=True)
+        except UnicodeDecodeError:
+            raise ValueError("Unsupported input: not a PDF, image or UTF-8 text")
+        if not found:
+            raise ValueError("No text in input")
+    
+    def iter_docx(self, source, cancel=None):
+        w = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+        try:
+            archive = zipfile.ZipFile(source)
+            xml = archive.open('word/document.xml')
+        except (zipfile.BadZipFile, KeyError):
+            raise ValueError("Not a valid DOCX file")
+        
+        found = False
+        with archive, xml:
+            # Elements are detached from their parent as soon as a paragraph
+            # is emitted, so memory stays bounded by the largest paragraph
+            stack = []
+            parts = []
+            depth = 0
+            for event, elem in ElementTree.iterparse(xml, events=('start', 'end')):
+                if event == 'start':
+                    stack.append(elem)
+                    if elem.tag == w + 'p':
+                        depth += 1
+                    continue
+                stack.pop()
+                if elem.tag == w + 't':
+                    parts.append(elem.text or '')
+                elif elem.tag == w + 'tab':
+                    parts.append('\t')
+                elif elem.tag in (w + 'br', w + 'cr'):
+                    parts.append('\n')
+                elif elem.tag == w + 'p':
+                    depth -= 1
+                    if depth:
+                        continue
+                    if cancel is not None:
+                        cancel.raise_if_cancelled()
+                    text = ''.join(parts)
+                    parts = []
+                    yield text if not found else '\n' + text
+                    found = found or bool(text.strip())
+                    if stack:
+                        stack[-1].remove(elem)
+        
+        if not found:
+            raise ValueError("No text in DOCX")
+    
+    @staticmethod
+    def _html_encoding(head):
+        # A BOM wins, then a declaration in the first chunk; UTF-8 otherwise
+        for bom, encoding in ((codecs.BOM_UTF8, 'utf-8-sig'), (codecs.BOM_UTF16_LE, 'utf-16'),
+                              (codecs.BOM_UTF16_BE, 'utf-16')):
+            if head.startswith(bom):
+                return encoding
+        m = HTML_CHARSET.search(head)
+        if m:
+            try:
+                name = codecs.lookup((m.group(1) or m.group(2)).decode('ascii')).name
+            except LookupError:
+                return 'utf-8'
+            return HTML_CHARSET_ALIASES.get(name, 'utf-8-sig' if name == 'utf-8' else name)
+        return 'utf-8-sig'
+    
+    def _iter_html_stream(self, stream, cancel=None, head=b''):
+        parser = HtmlParagraphParser()
+        chunk = head or stream.read(STREAM_CHUNK)
+        if len(chunk) < STREAM_CHUNK:
+            # Make sure the declaration in <head> is seen before decoding starts
+            chunk += stream.read(STREAM_CHUNK - len(chunk))
+        encoding = self._html_encoding(chunk)
+        decoder = codecs.getincrementaldecoder(encoding)()
+        while True:
+            try:
+                text = decoder.decode(chunk, final=not chunk)
+            except UnicodeDecodeError:
+                raise ValueError(f"HTML is not valid {encoding.replace('-sig', '')} text "
+                                 f"(declare its charset in a <meta> tag)")
+            parser.feed(text)
+            if not chunk:
+                parser.close()
+            yield from parser.paragraphs
+            parser.paragraphs = []
+            if not chunk:
+                return
+            if cancel is not None:
+                cancel.raise_if_cancelled()
+            chunk = stream.read(STREAM_CHUNK)
+    
+    def iter_html(self, stream, cancel=None, head=b''):
+        found = False
+        for para in self._iter_html_stream(stream, cancel, head):
+            yield para if not found else '\n' + para
+            found = True
+        if not found:
+            raise ValueError("No text in HTML")
+    
+    def iter_epub(self, source, cancel=None):
+        try:
+            archive = zipfile.ZipFile(source)
+            container = ElementTree.fromstring(archive.read('META-INF/container.xml'))
+        except (zipfile.BadZipFile, KeyError, ElementTree.ParseError):
+            raise ValueError("Not a valid EPUB file")
+        
+        with archive:
+            ns = {'c': 'urn:oasis:names:tc:opendocument:xmlns:container',
+                  'opf': 'http://www.idpf.org/2007/opf'}
+            opf_path = container.find('.//c:rootfile', ns).get('full-path')
+            opf = ElementTree.fromstring(archive.read(opf_path))
+            base = posixpath.dirname(opf_path)
+            manifest = {item.get('id'): item.get('href')
+                        for item in opf.iterfind('opf:manifest/opf:item', ns)}
+            spine = [manifest.get(ref.get('idref'))
+                     for ref in opf.iterfind('opf:spine/opf:itemref', ns)]
+            
+            self._log(f"Processing EPUB with {len(spine)} spine item(s)...")
+            found = False
+            for i, href in enumerate(spine, 1):
+                if href is None:
+                    continue
+                if cancel is not None:
+                    cancel.raise_if_cancelled()
+                self._log(f"  Item {i}/{len(spine)}...", end='\r')
+                self._progress('item', i, len(spine))
+                name = posixpath.normpath(posixpath.join(base, unquote(href)))
+                try:
+                    member = archive.open(name)
+                except KeyError:
+                    self._log(f"\n  Warning: {name} listed in spine but missing")
+                    continue
+                with member:
+                    first = True
+                    for para in self._iter_html_stream(member, cancel):
+                        yield i, para if first else '\n' + para
+                        found, first = True, False
+            self._log()
+        
+        if not found:
+            raise ValueError("No text in EPUB")
     
-    def process_file(self, path):
-        if not os.path.exists(path):
-            raise FileNotFoundError(f"File not found: {path}")
+    def iter_pages(self, source, cancel=None, kind=None):
+        """Yield (page, text) chunks in order.
+
+        source is a path, '-' for stdin, bytes/bytearray/memoryview or a binary
+        file-like object; kind (e.g. '.pdf') overrides extension/magic detection.
+        page is the PDF page, image frame or EPUB spine item number (1 for
+        formats without pages); a page may arrive in several chunks. With a
+        page range set, only those PDF pages / image frames are read.
+        """
+        self.events = []
+        head = b''
+        if isinstance(source, str) and source == '-':
+            source = sys.stdin.buffer
+        if isinstance(source, (str, os.PathLike)):
+            if not os.path.exists(source):
+                raise FileNotFoundError(f"File not found: {source}")
+            ext = kind or Path(source).suffix.lower()
+        else:
+            if isinstance(source, (bytes, bytearray, memoryview)):
+                source = io.BytesIO(source)
+            head = source.read(STREAM_CHUNK)
+            ext = kind or sniff_type(head)
+            if ext not in STREAMED_TYPES:
+                # Containers need random access: buffer the rest in memory
+                source, head = io.BytesIO(head + source.read()), b''
         
-        ext = Path(path).suffix.lower()
+        if self.pages is not None and ext not in PAGED_TYPES:
+            raise ValueError(f"Page ranges apply to PDF and image input, not {ext}")
         if ext == '.pdf':
-            return self.extract_pdf(path)
-        elif ext in ['.png', '.jpg', '.jpeg']:
-            return self.extract_image(path)
+            yield from self.iter_pdf(source, cancel=cancel)
+        elif ext in ['.png', '.jpg', '.jpeg', '.tif', '.tiff']:
+            yield from self.iter_image(source, cancel=cancel)
+        elif ext == '.docx':
+            for chunk in self.iter_docx(source, cancel=cancel):
+                yield 1, chunk
+        elif ext == '.epub':
+            yield from self.iter_epub(source, cancel=cancel)
+        elif ext in STREAMED_TYPES:
+            reader = self.iter_textfile if ext == '.txt' else self.iter_html
+            if isinstance(source, (str, os.PathLike)):
+                with open(source, 'rb') as f:
+                    for chunk in reader(f, cancel):
+                        yield 1, chunk
+            else:
+                for chunk in reader(source, cancel, head):
+                    yield 1, chunk
         else:
-            raise ValueError(f"Unsupported: {ext}. Use .pdf, .png, .jpg, .jpeg")
+            raise ValueError(f"Unsupported: {ext}. Use .pdf, .png, .jpg, .jpeg, .tif, .tiff, .txt, "
+                             ".docx, .epub, .html")
+    
+    def iter_text(self, source, cancel=None, kind=None):
+        """Yield extracted text in order; joined, the chunks equal process_file()."""
+        last = None
+        for page, chunk in self.iter_pages(source, cancel=cancel, kind=kind):
+            # Pages, frames and chapters are separated by a blank line
+            if last is not None and page != last:
+                chunk = '\n\n' + chunk
+            last = page
+            yield chunk
+    
+    def process_file(self, path, cancel=None):
+        return ''.join(self.iter_text(path, cancel=cancel))
+    
+    def extract_pages(self, source, cancel=None, kind=None):
+        """Return [(page number, text)], chunks of the same page joined;
+        '\n\n'.join() of the texts equals process_file()."""
+        pages = []
+        for number, chunk in self.iter_pages(source, cancel=cancel, kind=kind):
+            if pages and pages[-1][0] == number:
+                pages[-1][1].append(chunk)
+            else:
+                pages.append((number, [chunk]))
+        return [(number, ''.join(parts)) for number, parts in pages]
     
     def save_normal_docx(self, text, output_path):
         try:
             from docx import Document
             from docx.shared import Pt
             from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
-            from docx.oxml.ns import qn
+            from docx.oxml import OxmlElement
         except ImportError:
             raise ImportError("Install python-docx: pip install python-docx")
         
@@ -164,18 +1097,33 @@ class FileProcessor:
                 doc.add_paragraph()
                 continue
             
-            lang = self.converter.detect_language(para_text)
+            runs = list(self.converter.script_runs(para_text))
+            # Paragraph direction follows the first strong (letter) run
+            rtl = next((s for s, _, _ in runs if s in ('arabic', 'latin')), None) == 'arabic'
             para = doc.add_paragraph()
-            run = para.add_run(para_text)
-            run.font.name = 'Arial'
-            run.font.size = Pt(12)
-            
-            if lang in ['arabic', 'mixed']:
+            if rtl:
+                # w:bidi must precede w:jc, so add it before setting alignment
+                para._element.get_or_add_pPr().append(OxmlElement('w:bidi'))
                 para.paragraph_format.alignment = WD_PARAGRAPH_ALIGNMENT.RIGHT
-                pPr = para._element.get_or_add_pPr()
-                pPr.set(qn('w:bidi'), '1')
             else:
                 para.paragraph_format.alignment = WD_PARAGRAPH_ALIGNMENT.LEFT
+            
+            # One w:r per direction change; neutrals left between scripts
+            # take the paragraph direction
+            pieces = []
+            for script, start, end in runs:
+                run_rtl = script == 'arabic' or (script == 'neutral' and rtl)
+                if pieces and pieces[-1][0] == run_rtl:
+                    pieces[-1][2] = end
+                else:
+                    pieces.append([run_rtl, start, end])
+            
+            for run_rtl, start, end in pieces:
+                run = para.add_run(para_text[start:end])
+                run.font.name = 'Arial'
+                run.font.size = Pt(12)
+                if run_rtl:
+                    run.font.rtl = True
         
         doc.save(output_path)
         return output_path
@@ -206,7 +1154,7 @@ class FileProcessor:
         doc.save(output_path)
         return output_path
     
-    def convert(self, input_path, output_txt=None):
+    def convert(self, input_path, output_txt=None, cancel=None, cells=False, isolate=None):
         print(f"\n{'='*60}")
         print("Braille Converter (English & Arabic)")
         print(f"{'='*60}")
@@ -214,12 +1162,22 @@ class FileProcessor:
         
         # Extract text
         try:
-            text = self.process_file(input_path)
+            if isolate is not None:
+                events = []
+                pages = isolate.extract_pages(input_path, cancel=cancel, events=events)
+            else:
+                pages = self.extract_pages(input_path, cancel=cancel)
+                events = self.events
+            text = '\n\n'.join(page for _, page in pages)
             print(f"\n✓ Extracted {len(text)} characters")
         except Exception as e:
             print(f"\n✗ Error: {e}")
             sys.exit(1)
         
+        timeouts = [e for e in events if e['kind'].endswith('_timeout')]
+        if timeouts:
+            print(f"⚠ {len(timeouts)} timeout(s) during extraction")
+        
         # Language stats
         stats = self.converter.get_language_stats(text)
         print(f"\nLanguage: {stats['primary_language'].upper()}")
@@ -230,13 +1188,17 @@ class FileProcessor:
         
         # Convert to Braille
         print("\nConverting to Braille...")
-        braille = self.converter.text_to_braille(text)
+        braille_pages = [(n, self.converter.text_to_braille(page)) for n, page in pages]
+        braille = '\n\n'.join(page for _, page in braille_pages)
         
         # Paths
-        base = Path(input_path).stem
+        base = 'stdin' if input_path == '-' else Path(input_path).stem
+        if self.pages is not None:
+            base += '_p' + format_page_ranges(self.pages).replace(',', '_')
         txt_path = output_txt or f"{base}_braille.txt"
         normal_docx = f"{base}_normal.docx"
         braille_docx = f"{base}_braille.docx"
+        cells_path = f"{base}_braille{BRAILLE_CELL_EXT}"
         
         # Save TXT
         try:
@@ -247,6 +1209,13 @@ class FileProcessor:
             print(f"✗ Text error: {e}")
             sys.exit(1)
         
+        if cells:
+            try:
+                write_braille_cells(cells_path, braille_pages)
+                print(f"✓ Cells: {cells_path}")
+            except Exception as e:
+                print(f"⚠ Cells error: {e}")
+        
         # Save Word documents
         print("\nGenerating Word documents...")
         try:
@@ -267,29 +1236,984 @@ class FileProcessor:
         
         print(f"\n{'='*60}\n")
         return txt_path
+    
+    def convert_stream(self, input_path, out=None, cancel=None, isolate=None):
+        # Braille only, written chunk by chunk (page by page for PDFs); no DOCX.
+        # An isolated worker hands back whole pages once the document is done
+        out = out or sys.stdout
+        try:
+            if isolate is not None:
+                pages = isolate.extract_pages(input_path, cancel=cancel)
+                chunks = ('\n\n' + text if i else text for i, (_, text) in enumerate(pages))
+            else:
+                chunks = self.iter_text(input_path, cancel=cancel)
+            for chunk in chunks:
+                out.write(self.converter.text_to_braille(chunk))
+                out.flush()
+        except Exception as e:
+            self._log(f"✗ Error: {e}")
+            sys.exit(1)
+
+
+
+def _isolated_worker(conn, memory_limit, cpu_limit, options):
+    # Child process: limits set here bind this process (and OCR subprocesses
+    # it starts) only. Jobs are (source, kind) tuples; None ends the worker.
+    try:
+        import resource
+    except ImportError:
+        resource = None  # not POSIX: isolation without limits
+    if resource is not None and memory_limit:
+        limit = int(memory_limit * 1024 * 1024)
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    
+    def log(*args, **kwargs):
+        conn.send(('log', ' '.join(str(a) for a in args), kwargs.get('end', '\n')))
+    
+    processor = FileProcessor(log_callback=log,
+                              progress_callback=lambda *args: conn.send(('progress',) + args),
+                              **options)
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            return
+        if job is None:
+            return
+        if resource is not None and cpu_limit:
+            # RLIMIT_CPU counts the whole process lifetime: budget from here on
+            usage = resource.getrusage(resource.RUSAGE_SELF)
+            soft = int(usage.ru_utime + usage.ru_stime + cpu_limit) + 1
+            hard = resource.getrlimit(resource.RLIMIT_CPU)[1]
+            if hard != resource.RLIM_INFINITY:
+                soft = min(soft, hard)
+            resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+        try:
+            conn.send(('done', processor.extract_pages(job[0], kind=job[1]), processor.events))
+        except MemoryError:
+            # The heap may be left fragmented: report, then let the parent respawn
+            conn.send(('error', WorkerCrashed(f"Memory limit ({memory_limit:g} MB) exceeded"),
+                       processor.events, True))
+            return
+        except Exception as e:
+            try:
+                pickle.dumps(e)
+            except Exception:
+                e = ValueError(str(e))
+            conn.send(('error', e, processor.events, False))
+
+
+class IsolatedProcessor:
+    """Runs FileProcessor.extract_pages() in recycled worker subprocesses.
+
+    memory_limit (MB, address space) and cpu_limit (CPU seconds per
+    document) are applied in each worker with `resource` (POSIX only). A
+    worker that dies or hits a limit fails just its document with
+    WorkerCrashed and is respawned on next use; workers are also replaced
+    after max_jobs documents so memory stays bounded. Thread-safe: up to
+    `workers` documents are extracted at once, so events come back per call
+    (see extract_pages) rather than on the instance. Remaining options go
+    to the workers' FileProcessor.
+    """
+
+    def __init__(self, workers=1, memory_limit=None, cpu_limit=None, max_jobs=50,
+                 log_callback=None, progress_callback=None, **options):
+        self.memory_limit = memory_limit
+        self.cpu_limit = cpu_limit
+        self.max_jobs = max_jobs
+        self.options = options
+        self._log = log_callback or print
+        self._progress = progress_callback or (lambda stage, current, total: None)
+        # spawn, not fork: callers (GUI, watch mode) have threads running
+        self._context = multiprocessing.get_context('spawn')
+        self._idle = queue.Queue()
+        self._workers = []
+        for _ in range(max(1, workers)):
+            self._idle.put(None)  # started on first use
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def _spawn(self):
+        conn, child = self._context.Pipe()
+        process = self._context.Process(target=_isolated_worker, daemon=True,
+                                        args=(child, self.memory_limit, self.cpu_limit,
+                                              self.options))
+        process.start()
+        child.close()
+        worker = {'process': process, 'conn': conn, 'jobs': 0}
+        self._workers.append(worker)
+        return worker
+    
+    def _retire(self, worker, kill=False):
+        if worker is None:
+            return
+        process = worker['process']
+        if kill:
+            process.kill()
+        else:
+            try:
+                worker['conn'].send(None)
+            except OSError:
+                pass
+        process.join(5)
+        if process.is_alive():
+            process.kill()
+            process.join()
+        worker['conn'].close()
+        if worker in self._workers:
+            self._workers.remove(worker)
+    
+    def _death_reason(self, exitcode):
+        if exitcode is None:
+            return "Worker stopped responding"
+        if exitcode >= 0:
+            return f"Worker exited unexpectedly (code {exitcode})"
+        if -exitcode == getattr(signal, 'SIGXCPU', None):
+            return f"CPU limit ({self.cpu_limit:g}s) exceeded"
+        try:
+            name = signal.Signals(-exitcode).name
+        except ValueError:
+            name = f"signal {-exitcode}"
+        if -exitcode == getattr(signal, 'SIGKILL', None):
+            return f"Worker killed ({name}, likely out of memory)"
+        return f"Worker crashed ({name})"
+    
+    def _wait(self, worker, cancel, log, progress):
+        conn, process = worker['conn'], worker['process']
+        while True:
+            if cancel is not None:
+                cancel.raise_if_cancelled()
+            try:
+                if not conn.poll(FileProcessor.POLL_INTERVAL):
+                    if not process.is_alive():
+                        raise EOFError
+                    continue
+                message = conn.recv()
+            except (EOFError, OSError):
+                process.join(1)
+                raise WorkerCrashed(self._death_reason(process.exitcode))
+            if message[0] == 'log':
+                log(message[1], end=message[2])
+            elif message[0] == 'progress':
+                progress(*message[1:])
+            else:
+                return message
+    
+    def extract_pages(self, source, cancel=None, kind=None, log=None, progress=None,
+                      events=None):
+        """FileProcessor.extract_pages() in a worker; log and progress
+        override the callbacks given to the constructor for this call. The
+        document's events (timeouts, worker crashes) are appended to the
+        events list when one is given."""
+        if isinstance(source, str) and source == '-':
+            source = sys.stdin.buffer
+        if isinstance(source, (str, os.PathLike)):
+            if not os.path.exists(source):
+                raise FileNotFoundError(f"File not found: {source}")
+            source = os.fspath(source)
+        elif isinstance(source, (bytearray, memoryview)):
+            source = bytes(source)
+        elif not isinstance(source, bytes):
+            source = source.read()  # streams can't cross the process boundary
+        
+        if events is None:
+            events = []
+        worker = self._idle.get()
+        try:
+            if worker is not None and (worker['jobs'] >= self.max_jobs
+                                       or not worker['process'].is_alive()):
+                self._retire(worker)
+                worker = None
+            if worker is None:
+                worker = self._spawn()
+            worker['jobs'] += 1
+            worker['conn'].send((source, kind))
+            message = self._wait(worker, cancel, log or self._log, progress or self._progress)
+            if message[0] == 'error' and message[3]:
+                self._retire(worker)
+                worker = None
+                events.append({'kind': 'worker_crashed', 'source': source_label(source),
+                               'reason': str(message[1])})
+        except BaseException as e:
+            # Dead, cancelled or interrupted mid-document: never reuse it
+            self._retire(worker, kill=True)
+            worker = None
+            if isinstance(e, WorkerCrashed):
+                events.append({'kind': 'worker_crashed', 'source': source_label(source),
+                               'reason': str(e)})
+            raise
+        finally:
+            self._idle.put(worker)
+        
+        events.extend(message[2])
+        if message[0] == 'done':
+            return message[1]
+        raise message[1]
+    
+    def process_file(self, path, cancel=None):
+        return '\n\n'.join(text for _, text in self.extract_pages(path, cancel=cancel))
+    
+    def close(self):
+        for worker in list(self._workers):
+            self._retire(worker)
+
+
+# Compact braille cell file (.brc), all integers little-endian:
+#   header   CELL_HEADER: magic, version, flags, page count, paragraph count,
+#            body offset, page index offset, paragraph index offset
+#   body     one byte per cell (U+2800 + byte) for bytes 0x00-0xFC; 0xFD is a
+#            space, 0xFE a newline, 0xFF escapes the next UTF-8 character
+#   pages    CELL_PAGE per page: body offset, first paragraph, source page number
+#   paras    body offset of every paragraph (line), u32 or u64 (CELL_WIDE flag)
+# Pages are stored back to back; readers rejoin them with a blank line.
+CELL_MAGIC = b'BRLC'
+CELL_VERSION = 1
+CELL_WIDE = 0x01
+CELL_HEADER = struct.Struct('<4sBBHIIQQQ')
+CELL_PAGE = struct.Struct('<QII')
+CELL_SPACE, CELL_NEWLINE, CELL_ESCAPE = 0xFD, 0xFE, 0xFF
+BRAILLE_CELL_EXT = '.brc'
+
+
+class _CellEncodeTable(dict):
+    # Maps characters to latin-1 characters standing in for the output bytes
+    def __init__(self):
+        super().__init__((0x2800 + b, chr(b)) for b in range(CELL_SPACE))
+        self[ord(' ')] = chr(CELL_SPACE)
+        self[ord('\n')] = chr(CELL_NEWLINE)
+    
+    def __missing__(self, code):
+        value = chr(CELL_ESCAPE) + chr(code).encode('utf-8').decode('latin-1')
+        self[code] = value
+        return value
+
+
+CELL_ENCODE = _CellEncodeTable()
+CELL_DECODE = {b: chr(0x2800 + b) for b in range(CELL_SPACE)}
+CELL_DECODE.update({CELL_SPACE: ' ', CELL_NEWLINE: '\n'})
+
+
+def encode_braille_cells(text):
+    return text.translate(CELL_ENCODE).encode('latin-1')
+
+
+def decode_braille_cells(data):
+    out = []
+    pos = 0
+    while True:
+        esc = data.find(CELL_ESCAPE, pos)
+        if esc < 0:
+            out.append(data[pos:].decode('latin-1').translate(CELL_DECODE))
+            return ''.join(out)
+        out.append(data[pos:esc].decode('latin-1').translate(CELL_DECODE))
+        lead = data[esc + 1]
+        size = 1 if lead < 0x80 else 2 if lead < 0xE0 else 3 if lead < 0xF0 else 4
+        out.append(data[esc + 1:esc + 1 + size].decode('utf-8'))
+        pos = esc + 1 + size
+
+
+def write_braille_cells(output, pages):
+    """Write (source page number, braille) pairs to a .brc path or seekable binary stream."""
+    if isinstance(output, (str, os.PathLike)):
+        with open(output, 'wb') as f:
+            return write_braille_cells(f, pages)
+    
+    start = output.tell()
+    output.write(b'\0' * CELL_HEADER.size)
+    body = CELL_HEADER.size
+    offset = body
+    page_index, para_offsets = [], []
+    for number, braille in pages:
+        page_index.append((offset, len(para_offsets), number))
+        data = encode_braille_cells(braille)
+        para_offsets.append(offset)
+        # UTF-8 escapes never contain 0xFE, so every CELL_NEWLINE is a line break
+        para_offsets.extend(offset + m.end() for m in re.finditer(b'\xfe', data))
+        output.write(data)
+        offset += len(data)
+    
+    wide = offset > 0xFFFFFFFF
+    page_at = offset
+    output.write(b''.join(CELL_PAGE.pack(*entry) for entry in page_index))
+    para_at = page_at + CELL_PAGE.size * len(page_index)
+    output.write(struct.pack(f"<{len(para_offsets)}{'Q' if wide else 'I'}", *para_offsets))
+    end = output.tell()
+    output.seek(start)
+    output.write(CELL_HEADER.pack(CELL_MAGIC, CELL_VERSION, CELL_WIDE if wide else 0, 0,
+                                  len(page_index), len(para_offsets), body, page_at, para_at))
+    output.seek(end)
+    return output
+
+
+class BrailleCellReader:
+    """Memory-mapped .brc reader; page(i) and paragraph(j) are O(1) lookups."""
+
+    def __init__(self, path):
+        self._file = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # mmap refuses empty files
+            self._file.close()
+            raise ValueError(f"Not a braille cell file: {path}")
+        try:
+            (magic, version, flags, _, self.page_count, self.paragraph_count,
+             self._body, self._pages, self._paras) = CELL_HEADER.unpack_from(self._map)
+        except struct.error:
+            magic = None
+        if magic != CELL_MAGIC:
+            self.close()
+            raise ValueError(f"Not a braille cell file: {path}")
+        if version != CELL_VERSION:
+            self.close()
+            raise ValueError(f"Unsupported braille cell file version: {version}")
+        self._para = struct.Struct('<Q' if flags & CELL_WIDE else '<I')
+    
+    def __len__(self):
+        return self.page_count
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def _page_entry(self, index):
+        if not 0 <= index < self.page_count:
+            raise IndexError(f"Page index out of range: {index}")
+        return CELL_PAGE.unpack_from(self._map, self._pages + index * CELL_PAGE.size)
+    
+    def _page_end(self, index):
+        return self._page_entry(index + 1)[0] if index + 1 < self.page_count else self._pages
+    
+    def page_number(self, index):
+        return self._page_entry(index)[2]
+    
+    def page(self, index):
+        start = self._page_entry(index)[0]
+        return decode_braille_cells(self._map[start:self._page_end(index)])
+    
+    def paragraph(self, index):
+        if not 0 <= index < self.paragraph_count:
+            raise IndexError(f"Paragraph index out of range: {index}")
+        start = self._para.unpack_from(self._map, self._paras + index * self._para.size)[0]
+        limit = self._pages
+        if index + 1 < self.paragraph_count:
+            limit = self._para.unpack_from(self._map, self._paras + (index + 1) * self._para.size)[0]
+        # The last line of a page runs to the next page without a newline
+        end = self._map.find(bytes([CELL_NEWLINE]), start, limit)
+        return decode_braille_cells(self._map[start:limit if end < 0 else end])
+    
+    def iter_pages(self):
+        for i in range(self.page_count):
+            yield self.page_number(i), self.page(i)
+    
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+
+def braille_cells_to_text(path, out):
+    """Write a .brc file back out as Unicode braille text, pages separated by a blank line."""
+    with BrailleCellReader(path) as reader:
+        for i, (_, braille) in enumerate(reader.iter_pages()):
+            out.write(braille if i == 0 else '\n\n' + braille)
+
+
+@dataclass
+class ConversionResult:
+    text: str
+    braille: str
+    stats: dict
+    pages: list = field(default_factory=list)
+    events: list = field(default_factory=list)
+    normal_docx: Optional[bytes] = None
+    braille_docx: Optional[bytes] = None
+    braille_cells: Optional[bytes] = None
+
+
+def _message_logger(log):
+    # FileProcessor logs print-style (end='\r', blank lines); pass on clean messages only
+    def emit(*args, **kwargs):
+        message = ' '.join(str(a) for a in args).strip()
+        if message and log is not None:
+            log(message)
+    return emit
+
+
+def convert_document(source, kind=None, docx=False, progress=None, log=None, cancel=None,
+                     cells=False, isolate=None, **options):
+    """Convert a document in memory; nothing is printed or written to disk.
+
+    source is bytes, bytearray, memoryview, a binary file-like object or a
+    path; kind (e.g. '.pdf') skips type detection. progress(stage, current,
+    total) is called per PDF page, image frame or EPUB item and log(message)
+    gets the messages the CLI would print. cells=True also fills
+    braille_cells with the .brc encoding. isolate (an IsolatedProcessor)
+    runs the extraction in its worker processes. Remaining options go to
+    FileProcessor (page_timeout, image_timeout, extract_mode, ocr_workers,
+    pages).
+    Errors are raised, never turned into sys.exit().
+    """
+    processor = FileProcessor(log_callback=_message_logger(log), progress_callback=progress,
+                              **options)
+    converter = processor.converter
+    
+    if isolate is not None:
+        events = []
+        extracted = isolate.extract_pages(source, cancel=cancel, kind=kind,
+                                          log=processor._log, progress=progress,
+                                          events=events)
+    else:
+        extracted = processor.extract_pages(source, cancel=cancel, kind=kind)
+        events = processor.events
+    pages = [{'page': number, 'text': page_text, 'braille': converter.text_to_braille(page_text)}
+             for number, page_text in extracted]
+    text = '\n\n'.join(page['text'] for page in pages)
+    braille = '\n\n'.join(page['braille'] for page in pages)
+    
+    result = ConversionResult(text=text, braille=braille,
+                              stats=converter.get_language_stats(text),
+                              pages=pages, events=list(events))
+    if docx:
+        normal, braille_doc = io.BytesIO(), io.BytesIO()
+        processor.save_normal_docx(text, normal)
+        processor.save_braille_docx(braille, braille_doc)
+        result.normal_docx = normal.getvalue()
+        result.braille_docx = braille_doc.getvalue()
+    if cells:
+        packed = write_braille_cells(io.BytesIO(), ((p['page'], p['braille']) for p in pages))
+        result.braille_cells = packed.getvalue()
+    return result
+
+
+async def convert_document_async(source, kind=None, docx=False, progress=None, log=None,
+                                 cancel=None, executor=None, **options):
+    """convert_document() run in an executor (the loop's default thread pool
+    unless given); callbacks are delivered on the event loop, and cancelling
+    the awaiting task cancels the conversion.
+
+    Extraction holds the GIL, so threads don't add throughput; for that,
+    pass isolate=IsolatedProcessor(workers=N) or a ProcessPoolExecutor. In
+    a process pool the conversion can't reach back to this process: log,
+    progress and cancel are not used, streams are read up front, and
+    cancelling the task only drops a conversion that has not started yet.
+    """
+    loop = asyncio.get_running_loop()
+    if isinstance(executor, ProcessPoolExecutor):
+        if isinstance(source, (bytearray, memoryview)):
+            source = bytes(source)
+        elif not isinstance(source, (str, os.PathLike, bytes)):
+            source = source.read()
+        return await loop.run_in_executor(executor, partial(convert_document, source, kind,
+                                                            docx, **options))
+    cancel = cancel or CancellationToken()
+    
+    def on_loop(callback):
+        if callback is None:
+            return None
+        return lambda *args: loop.call_soon_threadsafe(callback, *args)
+    
+    job = partial(convert_document, source, kind, docx, on_loop(progress), on_loop(log),
+                  cancel, **options)
+    try:
+        return await loop.run_in_executor(executor, job)
+    except asyncio.CancelledError:
+        cancel.cancel()
+        raise
+
+
+class FolderWatcher:
+    """Converts files dropped into input_dir, each once it has stopped changing.
+
+    The folder is polled (stdlib only): a file is picked up after its size
+    and mtime have held still for `settle` seconds, hashed, and queued for a
+    pool of `workers` threads. Outputs mirror the input tree under
+    output_dir; inputs that fail are moved to error_dir next to a
+    <name>.error.txt note. With isolate (an IsolatedProcessor), extraction
+    runs in its worker processes, so a crashing input fails on its own. Converted content hashes go to a ledger in
+    output_dir, so restarts and re-dropped copies are not converted again.
+    """
+    LEDGER = '.braille-watch.jsonl'
+    STATUS = '.braille-watch-status.json'
+    PARTIAL_SUFFIXES = ('.tmp', '.part', '.crdownload', '.download')
+    LATENCY_WINDOW = 200
+
+    def __init__(self, input_dir, output_dir, error_dir=None, status_file=None, workers=2,
+                 interval=2.0, settle=5.0, docx=True, log_callback=None, isolate=None, **options):
+        self.input_dir = Path(input_dir).resolve()
+        self.output_dir = Path(output_dir).resolve()
+        self.error_dir = (Path(error_dir) if error_dir
+                          else self.input_dir.with_name(self.input_dir.name + '_errors')).resolve()
+        self.status_file = Path(status_file) if status_file else self.output_dir / self.STATUS
+        self.workers = max(1, workers)
+        self.interval = interval
+        self.settle = settle
+        self.docx = docx
+        self.isolate = isolate
+        self.options = options
+        self._log = log_callback or print
+        
+        self._settling = {}   # rel path -> (size, mtime_ns, first seen, unchanged since)
+        self._queue = collections.deque()
+        self._in_flight = {}  # future -> job
+        self._held = []       # jobs whose content is queued or in flight as another file
+        self._known = {}      # rel path -> (size, mtime_ns) already handled
+        self._hashes = set()  # sha256 of every converted input
+        self._outputs = {}    # output base (rel folder + name stem) -> rel path that owns it
+        self._done_at = collections.deque()
+        self._latencies = collections.deque(maxlen=self.LATENCY_WINDOW)
+        self._started = time.time()
+        self.counts = {'converted': 0, 'failed': 0, 'duplicates': 0}
+        self.last_error = None
+    
+    def _load_ledger(self):
+        ledger = self.output_dir / self.LEDGER
+        if not ledger.exists():
+            return
+        with open(ledger, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # torn last line after a crash
+                self._known[entry['path']] = (entry['size'], entry['mtime_ns'])
+                if entry['result'] == 'converted':
+                    self._hashes.add(entry['sha256'])
+                    rel = Path(entry['path'])
+                    base = (rel.parent / entry.get('output', rel.stem)).as_posix()
+                    self._outputs[base] = entry['path']
+    
+    def _append_ledger(self, job, result):
+        entry = {'path': job['rel'], 'size': job['size'], 'mtime_ns': job['mtime_ns'],
+                 'sha256': job['sha256'], 'result': result, 'time': time.time()}
+        if result == 'converted':
+            entry['output'] = job['output']
+        with open(self.output_dir / self.LEDGER, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        self._known[job['rel']] = (job['size'], job['mtime_ns'])
+    
+    def _scan(self):
+        skip = {self.output_dir, self.error_dir}
+        stack = [self.input_dir]
+        while stack:
+            folder = stack.pop()
+            try:
+                entries = list(os.scandir(folder))
+            except OSError:
+                continue
+            for entry in entries:
+                name = entry.name
+                if name.startswith(('.', '~$')) or name.lower().endswith(self.PARTIAL_SUFFIXES):
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    if Path(entry.path) not in skip:
+                        stack.append(Path(entry.path))
+                elif entry.is_file():
+                    try:
+                        yield Path(entry.path).relative_to(self.input_dir).as_posix(), entry.stat()
+                    except OSError:
+                        continue  # removed while scanning
+    
+    def _poll(self):
+        now = time.monotonic()
+        seen = set()
+        for rel, st in self._scan():
+            seen.add(rel)
+            stamp = (st.st_size, st.st_mtime_ns)
+            if self._known.get(rel) == stamp:
+                continue
+            previous = self._settling.get(rel)
+            if previous is None or previous[:2] != stamp:
+                # New or still being written: restart its settle clock
+                self._settling[rel] = stamp + (previous[2] if previous else now, now)
+            elif now - previous[3] >= self.settle:
+                del self._settling[rel]
+                self._admit(rel, stamp, previous[2])
+        for rel in list(self._settling):
+            if rel not in seen:
+                del self._settling[rel]
+    
+    def _admit(self, rel, stamp, first_seen):
+        # Claimed now so later polls leave it alone; a changed stamp re-admits it
+        self._known[rel] = stamp
+        job = {'rel': rel, 'size': stamp[0], 'mtime_ns': stamp[1], 'seen': first_seen}
+        try:
+            job['sha256'] = self._hash(self.input_dir / rel)
+        except OSError as e:
+            del self._known[rel]
+            self._log(f"⚠ {rel}: cannot read ({e}), will retry")
+            return
+        self._held = [held for held in self._held if held['rel'] != rel]  # rewritten since
+        self._enqueue(job)
+    
+    def _enqueue(self, job):
+        if job['sha256'] in self._hashes:
+            self.counts['duplicates'] += 1
+            self._append_ledger(job, 'duplicate')
+            self._log(f"= {job['rel']}: same content already converted, skipped")
+        elif any(j['sha256'] == job['sha256']
+                 for j in list(self._queue) + list(self._in_flight.values())):
+            # Not a duplicate yet: if that conversion fails, this copy gets its turn
+            self._held.append(job)
+        else:
+            self._queue.append(job)
+    
+    def _release_held(self, sha256):
+        # The job holding these back has settled: they are duplicates now, or
+        # (if it failed) the first of them is queued and the rest wait on it
+        held = [job for job in self._held if job['sha256'] == sha256]
+        self._held = [job for job in self._held if job['sha256'] != sha256]
+        for job in held:
+            self._enqueue(job)
+    
+    @staticmethod
+    def _hash(path):
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(partial(f.read, STREAM_CHUNK), b''):
+                digest.update(block)
+        return digest.hexdigest()
+    
+    def _claim_output(self, job):
+        # Outputs are named after the input's stem; when another input in the
+        # same folder already owns that stem (report.txt next to report.html),
+        # the full name is used instead (report.html_braille.txt)
+        rel = Path(job['rel'])
+        for name in (rel.stem, rel.name):
+            owner = self._outputs.setdefault((rel.parent / name).as_posix(), job['rel'])
+            if owner == job['rel']:
+                if name != rel.stem:
+                    self._log(f"⚠ {job['rel']}: {rel.stem}_braille.txt is taken, "
+                              f"writing {name}_braille.txt")
+                return name
+        return None
+    
+    def _release_output(self, job):
+        if job.get('output') is not None:
+            self._outputs.pop((Path(job['rel']).parent / job['output']).as_posix(), None)
+    
+    def _convert(self, job):
+        source = self.input_dir / job['rel']
+        if source.suffix.lower() not in SUPPORTED_TYPES:
+            raise ValueError(f"Unsupported: {source.suffix or 'no extension'}")
+        if job['output'] is None:
+            raise ValueError(f"Output name clash: {source.stem}_braille.* and "
+                             f"{source.name}_braille.* both belong to other inputs")
+        start = time.monotonic()
+        result = convert_document(str(source), docx=self.docx, isolate=self.isolate,
+                                  **self.options)
+        target = self.output_dir / Path(job['rel']).parent
+        target.mkdir(parents=True, exist_ok=True)
+        base = job['output']
+        outputs = [(f"{base}_braille.txt", result.braille.encode('utf-8'))]
+        if self.docx:
+            outputs += [(f"{base}_normal.docx", result.normal_docx),
+                        (f"{base}_braille.docx", result.braille_docx)]
+        for name, data in outputs:
+            # Write then rename, so readers of the output tree never see a partial file
+            partial_path = target / f".{name}.tmp"
+            partial_path.write_bytes(data)
+            os.replace(partial_path, target / name)
+        return time.monotonic() - start, [name for name, _ in outputs]
+    
+    def _fail(self, job, error):
+        self.counts['failed'] += 1
+        self.last_error = f"{job['rel']}: {error}"
+        target = self.error_dir / job['rel']
+        try:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.move(str(self.input_dir / job['rel']), str(target))
+            target.with_name(target.name + '.error.txt').write_text(f"{error}\n", encoding='utf-8')
+            self._log(f"✗ {job['rel']}: {error} (moved to {target})")
+        except OSError as e:
+            # Left in place; it stays claimed in _known, so it is not retried every poll
+            self._log(f"✗ {job['rel']}: {error} (could not move to {self.error_dir}: {e})")
+    
+    def _collect(self, block=False):
+        if not self._in_flight:
+            return
+        timeout = None if block else 0
+        done, _ = wait(self._in_flight, timeout=timeout, return_when=FIRST_COMPLETED)
+        for future in done:
+            job = self._in_flight.pop(future)
+            try:
+                seconds, names = future.result()
+            except Exception as e:
+                self._release_output(job)
+                self._fail(job, e)
+            else:
+                self.counts['converted'] += 1
+                self._hashes.add(job['sha256'])
+                self._append_ledger(job, 'converted')
+                self._done_at.append(time.monotonic())
+                self._latencies.append(time.monotonic() - job['seen'])
+                self._log(f"✓ {job['rel']} → {', '.join(names)} ({seconds:.1f}s)")
+            self._release_held(job['sha256'])
+    
+    def status(self):
+        now = time.monotonic()
+        while self._done_at and now - self._done_at[0] > 3600:
+            self._done_at.popleft()
+        latencies = sorted(self._latencies)
+        hours = max(time.time() - self._started, 1) / 3600
+        return {
+            'updated': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'started': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(self._started)),
+            'input_dir': str(self.input_dir),
+            'output_dir': str(self.output_dir),
+            **self.counts,
+            'settling': len(self._settling),
+            'queued': len(self._queue),
+            'held': len(self._held),
+            'in_flight': len(self._in_flight),
+            'converted_last_hour': len(self._done_at),
+            'files_per_hour': round(self.counts['converted'] / hours, 1),
+            'latency_seconds': {
+                'last': round(self._latencies[-1], 2) if latencies else None,
+                'mean': round(sum(latencies) / len(latencies), 2) if latencies else None,
+                # Nearest rank: the smallest latency at or above 95% of the window
+                'p95': (round(latencies[min(len(latencies) - 1,
+                                            math.ceil(0.95 * len(latencies)) - 1)], 2)
+                        if latencies else None),
+            },
+            'last_error': self.last_error,
+        }
+    
+    def _write_status(self):
+        self.status_file.parent.mkdir(parents=True, exist_ok=True)
+        partial_path = self.status_file.with_name(f".{self.status_file.name}.tmp")
+        partial_path.write_text(json.dumps(self.status(), indent=2), encoding='utf-8')
+        os.replace(partial_path, self.status_file)
+    
+    def run(self, once=False, stop=None):
+        """Poll until stop (a CancellationToken) is cancelled or Ctrl-C; with
+        once=True, return when everything currently in the folder is handled."""
+        if not self.input_dir.is_dir():
+            raise FileNotFoundError(f"Input folder not found: {self.input_dir}")
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self._load_ledger()
+        self._log(f"Watching {self.input_dir} → {self.output_dir} "
+                  f"({self.workers} worker(s), errors to {self.error_dir})")
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            try:
+                while stop is None or not stop.cancelled:
+                    self._poll()
+                    while self._queue and len(self._in_flight) < self.workers:
+                        job = self._queue.popleft()
+                        job['output'] = self._claim_output(job)
+                        self._in_flight[pool.submit(self._convert, job)] = job
+                    self._collect()
+                    self._write_status()
+                    if once and not (self._settling or self._queue or self._in_flight
+                                     or self._held):
+                        break
+                    time.sleep(self.interval)
+            except KeyboardInterrupt:
+                self._log("\nStopping: finishing files in progress...")
+            self._queue.clear()
+            self._held.clear()
+            while self._in_flight:
+                self._collect(block=True)
+            self._write_status()
+        return self.counts
+
+
+def add_extraction_arguments(parser):
+    parser.add_argument('--page-timeout', type=float, default=None, metavar='SECONDS',
+                       help='Skip PDF pages whose text extraction exceeds this budget; '
+                            'pages are then read in a child process that is killed at the '
+                            'deadline (a document with 10 timed-out pages fails)')
+    parser.add_argument('--image-timeout', type=float, default=None, metavar='SECONDS',
+                       help='Abort OCR of an image that exceeds this budget')
+    parser.add_argument('--ocr-workers', type=int, default=None, metavar='N',
+                       help='Parallel OCR workers for multi-frame images (default: CPU count)')
+    parser.add_argument('--ocr-mode', choices=OCR_MODES, default='single',
+                       help='single: one OCR pass (default); two-pass: re-OCR only '
+                            'low-confidence lines at higher resolution')
+    parser.add_argument('--reocr-threshold', type=float, default=60, metavar='CONF',
+                       help='Two-pass: re-OCR lines containing a word below this confidence (0-100)')
+    parser.add_argument('--reocr-scale', type=float, default=2.0, metavar='FACTOR',
+                       help='Two-pass: upscale factor for re-OCRed lines (default: 2)')
+    parser.add_argument('--extract-mode', choices=sorted(PDF_READERS), default='layout',
+                       help='PDF text extraction: layout (full reconstruction, default) '
+                            'or fast (text layer only, no layout analysis)')
+
+
+def add_isolation_arguments(parser):
+    parser.add_argument('--isolate', action='store_true',
+                       help='Extract in a separate worker process, so a crashing or runaway '
+                            'input fails on its own')
+    parser.add_argument('--memory-limit', type=float, default=None, metavar='MB',
+                       help='Isolated worker memory (address space) limit; implies --isolate')
+    parser.add_argument('--cpu-limit', type=float, default=None, metavar='SECONDS',
+                       help='Isolated worker CPU time per document; implies --isolate')
+
+
+def isolated_processor(args, workers=1, **options):
+    # IsolatedProcessor for add_isolation_arguments(), or None when not asked for
+    if not (args.isolate or args.memory_limit or args.cpu_limit):
+        return None
+    return IsolatedProcessor(workers=workers, memory_limit=args.memory_limit,
+                             cpu_limit=args.cpu_limit, **options)
+
+
+def extraction_options(args):
+    # FileProcessor keyword arguments from add_extraction_arguments()
+    return dict(page_timeout=args.page_timeout, image_timeout=args.image_timeout,
+                extract_mode=args.extract_mode, ocr_workers=args.ocr_workers,
+                ocr_mode=args.ocr_mode, reocr_threshold=args.reocr_threshold,
+                reocr_scale=args.reocr_scale)
+
+
+WATCH_ONLY_OPTIONS = ('error_dir', 'status_file', 'workers', 'interval', 'settle', 'no_docx',
+                      'once')
+
+
+def add_watch_arguments(parser):
+    group = parser.add_argument_group(
+        'watch mode',
+        'With --watch, input_file is a folder: every file dropped into it is converted '
+        'once it has finished being written')
+    group.add_argument('--watch', default=None, metavar='OUTPUT_DIR',
+                       help='Watch the input folder (subfolders included); outputs go here, '
+                            'mirroring the input tree')
+    group.add_argument('--error-dir', default=None,
+                       help='Failed inputs are moved here (default: <input_dir>_errors)')
+    group.add_argument('--status-file', default=None,
+                       help=f'JSON status file (default: <output_dir>/{FolderWatcher.STATUS})')
+    group.add_argument('--workers', type=int, default=2, metavar='N',
+                       help='Files converted in parallel (default: 2)')
+    group.add_argument('--interval', type=float, default=2.0, metavar='SECONDS',
+                       help='Polling interval (default: 2)')
+    group.add_argument('--settle', type=float, default=5.0, metavar='SECONDS',
+                       help='Size and mtime must hold still this long before a file '
+                            'is picked up (default: 5)')
+    group.add_argument('--no-docx', action='store_true', help='Write only the Braille TXT')
+    group.add_argument('--once', action='store_true',
+                       help='Convert what is in the folder now, then exit')
+
+
+def watch_main(args):
+    isolate = isolated_processor(args, workers=args.workers, **extraction_options(args))
+    watcher = FolderWatcher(args.input_file, args.watch, error_dir=args.error_dir,
+                            status_file=args.status_file, workers=args.workers,
+                            interval=args.interval, settle=args.settle,
+                            docx=not args.no_docx, isolate=isolate, **extraction_options(args))
+    try:
+        counts = watcher.run(once=args.once)
+    except FileNotFoundError as e:
+        print(f"✗ Error: {e}")
+        sys.exit(1)
+    finally:
+        if isolate is not None:
+            isolate.close()
+    print(f"Converted {counts['converted']}, failed {counts['failed']}, "
+          f"duplicates {counts['duplicates']}")
 
 
 def main():
     parser = argparse.ArgumentParser(
-        description='Convert PDF/images to Braille (English & Arabic)',
+        description='Convert PDF/images/documents to Braille (English & Arabic)',
         epilog="""
 Examples:
   %(prog)s document.pdf
   %(prog)s image.png -o output.txt
+  cat notes.txt | %(prog)s - --stdout > notes_braille.txt
+  %(prog)s book.pdf --cells
+  %(prog)s book.pdf --pages 120-135,400
+  %(prog)s upload.pdf --memory-limit 1024 --cpu-limit 120
+  %(prog)s book_braille.brc -o book_braille.txt
+  %(prog)s inbox/ --watch outbox/ --workers 4 --error-dir failed/
+
+Watch mode writes its status (throughput, queue depth, latency) to the
+status file every poll; a ledger of converted content hashes in the output
+folder keeps files from being converted twice, across restarts too.
 
 Outputs:
   <input>_braille.txt   - Braille text
   <input>_normal.docx   - Normal text (RTL for Arabic)
   <input>_braille.docx  - Braille in Word
+  <input>_braille.brc   - Compact braille cells with page index (--cells)
         """
     )
-    parser.add_argument('input_file', help='PDF or image file')
-    parser.add_argument('-o', '--output', dest='output_file', 
+    parser.add_argument('input_file',
+                       help="PDF, image (incl. multi-page TIFF), .txt, .docx, .epub or .html "
+                            "file, or '-' to read from stdin; a .brc file is unpacked to "
+                            "Unicode braille text; with --watch, the folder to watch")
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument('-o', '--output', dest='output_file', 
                        help='Output text file path (optional)', default=None)
+    output.add_argument('--stdout', action='store_true',
+                       help='Write only the Braille text to stdout (no DOCX); '
+                            'progress goes to stderr')
+    add_extraction_arguments(parser)
+    add_isolation_arguments(parser)
+    parser.add_argument('--pages', default=None, metavar='RANGES',
+                       help="Convert only these PDF pages / image frames, e.g. 120-135,400 "
+                            "or 400- (outputs are labelled with the page numbers)")
+    parser.add_argument('--cells', action='store_true',
+                       help='Also write <input>_braille.brc: one byte per braille cell '
+                            'with a page/paragraph index')
+    add_watch_arguments(parser)
     
     args = parser.parse_args()
-    processor = FileProcessor()
-    processor.convert(args.input_file, args.output_file)
+    if args.watch is not None:
+        for option, used in (('--output', args.output_file is not None),
+                             ('--stdout', args.stdout), ('--pages', args.pages is not None),
+                             ('--cells', args.cells)):
+            if used:
+                parser.error(f"argument {option}: not allowed with argument --watch")
+        return watch_main(args)
+    for dest in WATCH_ONLY_OPTIONS:
+        if getattr(args, dest) != parser.get_default(dest):
+            parser.error(f"argument --{dest.replace('_', '-')}: only allowed with --watch")
+    try:
+        pages = parse_page_ranges(args.pages) if args.pages else None
+    except ValueError as e:
+        parser.error(str(e))
+    if args.stdout and args.cells:
+        parser.error("argument --cells: not allowed with argument --stdout "
+                     "(--stdout writes only the Braille text)")
+    if Path(args.input_file).suffix.lower() == BRAILLE_CELL_EXT:
+        # Unpacking reproduces the stored text as is: page selection and
+        # re-encoding don't apply
+        for option, used in (('--pages', pages is not None), ('--cells', args.cells)):
+            if used:
+                parser.error(f"argument {option}: not allowed with {BRAILLE_CELL_EXT} input")
+        try:
+            if args.stdout:
+                sys.stdout.reconfigure(encoding='utf-8')
+                braille_cells_to_text(args.input_file, sys.stdout)
+            else:
+                txt_path = args.output_file or f"{Path(args.input_file).stem}.txt"
+                with open(txt_path, 'w', encoding='utf-8') as f:
+                    braille_cells_to_text(args.input_file, f)
+                print(f"✓ Text: {txt_path}")
+        except Exception as e:
+            print(f"✗ Error: {e}", file=sys.stderr)
+            sys.exit(1)
+        return
+    
+    log_callback = partial(print, file=sys.stderr) if args.stdout else None
+    processor = FileProcessor(log_callback=log_callback, pages=pages,
+                              **extraction_options(args))
+    isolate = isolated_processor(args, log_callback=log_callback, pages=pages,
+                                 **extraction_options(args))
+    try:
+        if args.stdout:
+            sys.stdout.reconfigure(encoding='utf-8')
+            processor.convert_stream(args.input_file, isolate=isolate)
+        else:
+            processor.convert(args.input_file, args.output_file, cells=args.cells,
+                              isolate=isolate)
+    finally:
+        if isolate is not None:
+            isolate.close()
 
 
 if __name__ == '__main__':
@@ -14,8 +14,29 @@ import re
 import tkinter as tk
 from tkinter import filedialog, messagebox
 from pathlib import Path
+import queue
 import threading
 import traceback
+import multiprocessing
+
+
+class BrailleTable(dict):
+    """str.translate() table; characters not listed are resolved once, then cached."""
+
+    def __init__(self, mapping, capital=None):
+        super().__init__((ord(k), v) for k, v in mapping.items())
+        self.mapping = mapping
+        self.capital = capital
+
+    def __missing__(self, code):
+        char = chr(code)
+        if self.capital and char.isupper():
+            lower = char.lower()
+            value = self.capital + self.mapping.get(lower, lower)
+        else:
+            value = char
+        self[code] = value
+        return value
 
 
 class BrailleConverter:
@@ -47,9 +68,22 @@ class BrailleConverter:
 
     CAPITAL_INDICATOR = '⠠'
 
+    ARABIC_RANGE = '\u0600-\u06FF\u0750-\u077F'
+
     def __init__(self):
         self.arabic_pattern = re.compile(r'[\u0600-\u06FF\u0750-\u077F]+')
         self.english_pattern = re.compile(r'[a-zA-Z]+')
+        a, letter = self.ARABIC_RANGE, rf'[^\W_{self.ARABIC_RANGE}0-9]'
+        self.script_pattern = re.compile(
+            rf'(?P<arabic>[{a}](?:[\W{a}_]*[{a}])?)'
+            rf'|(?P<latin>{letter}(?:[^{a}0-9]*{letter})?)'
+            rf'|(?P<digit>[0-9]+)'
+            rf'|(?P<neutral>(?:[^\w{a}]|_)+)'
+        )
+        self.braille_table = BrailleTable(
+            {**self.ENGLISH_BRAILLE,
+             **{k: v for k, v in self.ARABIC_BRAILLE.items() if self.is_arabic(k)}},
+            capital=self.CAPITAL_INDICATOR)
 
     def is_arabic(self, char):
         return '\u0600' <= char <= '\u06FF' or '\u0750' <= char <= '\u077F'
@@ -61,19 +95,15 @@ class BrailleConverter:
             return 'mixed'
         return 'arabic' if arabic_count > 0 else 'english'
 
+    def script_runs(self, text):
+        """Yield (script, start, end) in one pass; script is arabic, latin, digit or neutral."""
+        for m in self.script_pattern.finditer(text):
+            yield m.lastgroup, m.start(), m.end()
+
     def text_to_braille(self, text):
         if not text:
             return ""
-        result = []
-        for char in text:
-            if self.is_arabic(char):
-                result.append(self.ARABIC_BRAILLE.get(char, char))
-            else:
-                if char.isupper():
-                    result.append(self.CAPITAL_INDICATOR)
-                    char = char.lower()
-                result.append(self.ENGLISH_BRAILLE.get(char, char))
-        return ''.join(result)
+        return text.translate(self.braille_table)
 
     def get_language_stats(self, text):
         arabic_count  = sum(1 for c in text if self.is_arabic(c))
@@ -86,11 +116,34 @@ class BrailleConverter:
         }
 
 
+def parse_page_ranges(spec):
+    """'120-135,400' -> ((120, 135), (400, 400)); '400-' runs to the last page."""
+    ranges = []
+    for part in spec.replace(' ', '').split(','):
+        match = re.fullmatch(r'(\d+)(-(\d*))?', part)
+        if not match or int(match[1]) < 1:
+            raise ValueError(f"Invalid page range: '{part}'  (expected e.g. 120-135,400)")
+        start = int(match[1])
+        end = start if not match[2] else int(match[3]) if match[3] else None
+        if end is not None and end < start:
+            raise ValueError(f"Invalid page range: '{part}'  (end before start)")
+        ranges.append((start, end))
+    return tuple(ranges)
+
+
+def page_numbers(ranges, total=None):
+    numbers = set()
+    for start, end in ranges:
+        numbers.update(range(start, (total if end is None else end) + 1))
+    return sorted(numbers)
+
+
 class FileProcessor:
 
-    def __init__(self, log_callback=None):
+    def __init__(self, log_callback=None, pages=None):
         self.converter   = BrailleConverter()
         self._log        = log_callback or print
+        self.pages       = pages
 
     def extract_pdf(self, path):
         try:
@@ -98,15 +151,32 @@ class FileProcessor:
         except ImportError:
             raise ImportError("pdfplumber is required.  Install it:\n  pip install pdfplumber")
 
+        # Closed ranges let pdfplumber skip building the other pages
+        wanted = None
+        if self.pages is not None and all(end for _, end in self.pages):
+            wanted = page_numbers(self.pages)
+
         extracted = []
-        with pdfplumber.open(path) as pdf:
-            total = len(pdf.pages)
-            self._log(f"Processing PDF … {total} page(s) found.")
-            for i, page in enumerate(pdf.pages, 1):
-                self._log(f"  Reading page {i}/{total} …")
+        with pdfplumber.open(path, pages=wanted) as pdf:
+            pages = pdf.pages
+            if self.pages is None:
+                total = len(pages)
+                self._log(f"Processing PDF … {total} page(s) found.")
+            else:
+                if wanted is None:
+                    keep = set(page_numbers(self.pages, len(pages)))
+                    pages = [page for page in pages if page.page_number in keep]
+                if not pages:
+                    raise ValueError("None of the requested pages are in this PDF.")
+                total = len(pages)
+                self._log(f"Processing PDF … {total} requested page(s).")
+            for k, page in enumerate(pages, 1):
+                i = page.page_number
+                self._log(f"  Reading page {i}/{total} …" if self.pages is None
+                          else f"  Reading page {i} ({k}/{total}) …")
                 text = page.extract_text()
                 if text:
-                    extracted.append(text)
+                    extracted.append(text if self.pages is None else f"Page {i}\n{text}")
                 else:
                     self._log(f"  ⚠ Page {i} is empty or image-only.")
         if not extracted:
@@ -144,6 +214,9 @@ class FileProcessor:
                 "  pip install pytesseract Pillow"
             )
 
+        if self.pages is not None and 1 not in page_numbers(self.pages, 1):
+            raise ValueError("None of the requested pages are in this image (it has 1 page).")
+
         self._resolve_tesseract()
 
         self._log("Running OCR on image …")
@@ -162,7 +235,7 @@ class FileProcessor:
         if not text.strip():
             raise ValueError("No text could be extracted from this image.")
         self._log(f"  Detected language: {self.converter.detect_language(text).upper()}")
-        return text
+        return text if self.pages is None else f"Page 1\n{text}"
 
     def process_file(self, path):
         if not os.path.exists(path):
@@ -180,7 +253,7 @@ class FileProcessor:
             from docx import Document
             from docx.shared import Pt
             from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
-            from docx.oxml.ns import qn
+            from docx.oxml import OxmlElement
         except ImportError:
             raise ImportError("python-docx is required.  Install it:\n  pip install python-docx")
 
@@ -192,17 +265,32 @@ class FileProcessor:
             if not para_text.strip():
                 doc.add_paragraph()
                 continue
-            lang  = self.converter.detect_language(para_text)
+            runs  = list(self.converter.script_runs(para_text))
+            # Paragraph direction follows the first strong (letter) run
+            rtl   = next((s for s, _, _ in runs if s in ('arabic', 'latin')), None) == 'arabic'
             para  = doc.add_paragraph()
-            run   = para.add_run(para_text)
-            run.font.name = 'Arial'
-            run.font.size = Pt(12)
-            if lang in ('arabic', 'mixed'):
+            if rtl:
+                # w:bidi must precede w:jc, so add it before setting alignment
+                para._element.get_or_add_pPr().append(OxmlElement('w:bidi'))
                 para.paragraph_format.alignment = WD_PARAGRAPH_ALIGNMENT.RIGHT
-                pPr = para._element.get_or_add_pPr()
-                pPr.set(qn('w:bidi'), '1')
             else:
                 para.paragraph_format.alignment = WD_PARAGRAPH_ALIGNMENT.LEFT
+            # One w:r per direction change; neutrals left between scripts
+            # take the paragraph direction
+            pieces = []
+            for script, start, end in runs:
+                run_rtl = script == 'arabic' or (script == 'neutral' and rtl)
+                if pieces and pieces[-1][0] == run_rtl:
+                    pieces[-1][2] = end
+                else:
+                    pieces.append([run_rtl, start, end])
+
+            for run_rtl, start, end in pieces:
+                run = para.add_run(para_text[start:end])
+                run.font.name = 'Arial'
+                run.font.size = Pt(12)
+                if run_rtl:
+                    run.font.rtl = True
 
         doc.save(output_path)
         return output_path
@@ -260,6 +348,37 @@ FONT_LOG     = ("Consolas", 10)
 FONT_STAT    = (FONT_FAMILY, 10, "bold")
 
 
+def isolated_process_file(path, pages, memory_limit, cpu_limit, messages):
+    # Child process entry point: a crash or runaway input here cannot take
+    # down the GUI. Limits need `resource`, so they only apply on POSIX; None
+    # leaves a limit as inherited.
+    try:
+        import resource
+    except ImportError:
+        resource = None
+    if resource is not None:
+        for name, value in ((resource.RLIMIT_AS, memory_limit and memory_limit << 20),
+                            (resource.RLIMIT_CPU, cpu_limit)):
+            if not value:
+                continue
+            hard = resource.getrlimit(name)[1]
+            if hard != resource.RLIM_INFINITY:
+                value = min(value, hard)  # can't raise an inherited hard limit
+            try:
+                resource.setrlimit(name, (value, value))
+            except (ValueError, OSError) as exc:
+                messages.put(("error", f"Cannot apply worker limits: {exc}"))
+                return
+    processor = FileProcessor(log_callback=lambda msg: messages.put(("log", msg)), pages=pages)
+    try:
+        messages.put(("done", processor.process_file(path)))
+    except MemoryError:
+        messages.put(("error", f"Memory limit ({memory_limit} MB) exceeded."
+                               if memory_limit else "Out of memory."))
+    except Exception as exc:
+        messages.put(("error", str(exc)))
+
+
 class ToolTip:
     def __init__(self, widget, text):
         self.widget = widget
@@ -389,6 +508,8 @@ class LogPanel(tk.Frame):
 class BrailleConverterApp(tk.Tk):
 
     WIN_W, WIN_H = 680, 720
+    MEMORY_LIMIT_MB = 2048   # default isolated worker limits (editable in the UI)
+    CPU_LIMIT_S     = 600
 
     def __init__(self):
         super().__init__()
@@ -485,6 +606,55 @@ class BrailleConverterApp(tk.Tk):
                                   accent=False, width=96, height=32)
         browse_out.grid(row=1, column=2, padx=(0, 12), pady=(4, 10))
 
+        tk.Label(card, text="Pages", font=FONT_BODY,
+                 bg=COLORS["surface"], fg=COLORS["text"]).grid(
+                     row=2, column=0, padx=(12, 6), pady=(0, 10), sticky="w")
+
+        self.pages_var = tk.StringVar()
+        entry_pages = tk.Entry(card, textvariable=self.pages_var, font=FONT_BODY,
+                               bd=0, bg=COLORS["log_bg"], fg=COLORS["text"],
+                               insertbackground=COLORS["text"], relief="flat",
+                               highlightthickness=1, highlightcolor=COLORS["accent"],
+                               highlightbackground=COLORS["border"])
+        entry_pages.grid(row=2, column=1, pady=(0, 10), ipady=6, sticky="ew", padx=(0, 6))
+        ToolTip(entry_pages, "Optional, e.g. 120-135,400 — leave empty for all pages")
+
+        # Affects extraction, not the exported files. Off by default: the limits
+        # can stop large but valid books that convert fine in-process
+        self.chk_isolate = tk.BooleanVar(value=False)
+        cb_isolate = tk.Checkbutton(card, variable=self.chk_isolate, text="Isolated",
+                                    font=FONT_BODY, bg=COLORS["surface"], fg=COLORS["text"],
+                                    activebackground=COLORS["surface"],
+                                    activeforeground=COLORS["text"],
+                                    selectcolor=COLORS["log_bg"],
+                                    indicatoron=True, bd=0)
+        cb_isolate.grid(row=2, column=2, padx=(0, 12), pady=(0, 10), sticky="w")
+        ToolTip(cb_isolate, "Extract in a separate process with the memory and "
+                            "CPU limits below; a bad file cannot crash the app")
+
+        tk.Label(card, text="Limits", font=FONT_BODY,
+                 bg=COLORS["surface"], fg=COLORS["text"]).grid(
+                     row=3, column=0, padx=(12, 6), pady=(0, 10), sticky="w")
+
+        limits = tk.Frame(card, bg=COLORS["surface"])
+        limits.grid(row=3, column=1, columnspan=2, pady=(0, 10), sticky="w")
+        self.memory_limit_var = tk.StringVar(value=str(self.MEMORY_LIMIT_MB))
+        self.cpu_limit_var    = tk.StringVar(value=str(self.CPU_LIMIT_S))
+        for col, (var, unit, tip) in enumerate([
+            (self.memory_limit_var, "MB memory", "Isolated worker address space; empty for no limit"),
+            (self.cpu_limit_var,    "s CPU",     "Isolated worker CPU time; empty for no limit "
+                                                 "(layout extraction takes about 0.13 s per page)"),
+        ]):
+            entry = tk.Entry(limits, textvariable=var, font=FONT_BODY, width=7,
+                             bd=0, bg=COLORS["log_bg"], fg=COLORS["text"],
+                             insertbackground=COLORS["text"], relief="flat",
+                             highlightthickness=1, highlightcolor=COLORS["accent"],
+                             highlightbackground=COLORS["border"])
+            entry.grid(row=0, column=2 * col, ipady=6, padx=(0 if col == 0 else 18, 6))
+            tk.Label(limits, text=unit, font=FONT_BODY,
+                     bg=COLORS["surface"], fg=COLORS["text_dim"]).grid(row=0, column=2 * col + 1)
+            ToolTip(entry, tip)
+
     def _export_card(self, parent, pad_x):
         card = tk.LabelFrame(parent, text=" Export Options ", font=(FONT_FAMILY, 10, "bold"),
                              bg=COLORS["surface"], fg=COLORS["text_dim"],
@@ -561,24 +731,46 @@ class BrailleConverterApp(tk.Tk):
         if not os.path.isfile(input_path):
             messagebox.showerror("File not found", f"Cannot find:\n{input_path}")
             return
+        spec = self.pages_var.get().strip()
+        try:
+            pages = parse_page_ranges(spec) if spec else None
+        except ValueError as e:
+            messagebox.showerror("Invalid pages", str(e))
+            return
+        limits = []
+        # Below ~256 MB the worker can't even load the PDF libraries
+        for var, label, minimum in ((self.memory_limit_var, "Memory limit (MB)", 256),
+                                    (self.cpu_limit_var, "CPU limit (s)", 1)):
+            value = var.get().strip()
+            if not value:
+                limits.append(None)
+            elif value.isdigit() and int(value) >= minimum:
+                limits.append(int(value))
+            else:
+                messagebox.showerror("Invalid limit", f"{label} must be a whole number of at "
+                                                      f"least {minimum}, or empty for no limit.")
+                return
 
         self._running = True
         self.btn_convert.configure_state(disabled=True)
         self._clear_log()
         self._clear_stats()
 
-        t = threading.Thread(target=self._do_convert, args=(input_path,), daemon=True)
+        t = threading.Thread(target=self._do_convert, args=(input_path, pages, limits), daemon=True)
         t.start()
 
-    def _do_convert(self, input_path: str):
+    def _do_convert(self, input_path: str, pages=None, limits=(None, None)):
         try:
-            self.processor = FileProcessor(log_callback=self._thread_log)
+            self.processor = FileProcessor(log_callback=self._thread_log, pages=pages)
 
             self._thread_log("─" * 52, "info")
             self._thread_log("  Braille Converter  ·  Starting …", "info")
             self._thread_log("─" * 52, "info")
 
-            text = self.processor.process_file(input_path)
+            if self.chk_isolate.get():
+                text = self._extract_isolated(input_path, pages, limits)
+            else:
+                text = self.processor.process_file(input_path)
             self._thread_log(f"✓  Extracted {len(text)} characters.", "success")
 
             stats = self.processor.converter.get_language_stats(text)
@@ -591,6 +783,9 @@ class BrailleConverterApp(tk.Tk):
             out_dir = self.output_var.get().strip() or os.getcwd()
             os.makedirs(out_dir, exist_ok=True)
             base = Path(input_path).stem
+            if pages is not None:
+                # Label partial conversions with the source page numbers
+                base += "_p" + "_".join(str(s) if s == e else f"{s}-{e or ''}" for s, e in pages)
 
             saved_any = False
 
@@ -638,11 +833,43 @@ class BrailleConverterApp(tk.Tk):
             self.after(0, self.btn_convert.configure_state, False)
             self.after(0, setattr, self, "_running", False)
 
+    def _extract_isolated(self, input_path: str, pages=None, limits=(None, None)):
+        ctx = multiprocessing.get_context("spawn")
+        messages = ctx.Queue()
+        worker = ctx.Process(target=isolated_process_file, daemon=True,
+                             args=(input_path, pages, *limits, messages))
+        worker.start()
+        try:
+            while True:
+                try:
+                    kind, payload = messages.get(timeout=0.1)
+                except queue.Empty:
+                    if worker.is_alive():
+                        continue
+                    try:
+                        kind, payload = messages.get(timeout=1)
+                    except queue.Empty:
+                        worker.join()
+                        raise RuntimeError(f"Extraction worker died (exit code {worker.exitcode}); "
+                                           f"the file may be malformed or too large.")
+                if kind == "log":
+                    self._thread_log(payload)
+                elif kind == "done":
+                    return payload
+                else:
+                    raise ValueError(payload)
+        finally:
+            if worker.is_alive():
+                worker.join(5)
+            if worker.is_alive():
+                worker.kill()
+
     def _thread_log(self, msg: str, level: str = "normal"):
         self.after(0, self.log, msg, level)
 
 
 def main():
+    multiprocessing.freeze_support()
     app = BrailleConverterApp()
     app.mainloop()
 